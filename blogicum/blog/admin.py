@@ -1,13 +1,118 @@
-from django.contrib import admin
+import hashlib
+from functools import reduce
+from operator import or_
 
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from django.contrib.auth import get_user_model
+from django.contrib.auth.admin import UserAdmin
+from django.core.exceptions import EmptyResultSet, ValidationError
+from django.db import transaction
+from django.db.models.functions import Substr
+
+from .cache import LISTINGS_NAMESPACE, POSTS_NAMESPACE
+from .deletion import soft_delete_users
+from .lookups import prefix_filter, prefix_variants
 from .models import Category, Location, Post, Comment
+from .paginators import PostPaginator
+from .signals import invalidate_posts
+from .widgets import LookupAutocompleteSelect
+
+
+SHORT_TEXT_LENGTH = 50
+
+User = get_user_model()
+
+
+class PostActionForm(ActionForm):
+    category = forms.ModelChoiceField(
+        Category.objects.all(),
+        required=False,
+        label='Категория',
+    )
+
+
+class PrefixLookupMixin:
+    """
+    Поиск и выбор связанных объектов по индексу.
+
+    Поиск по полям с «^» идёт диапазонами по индексу, как
+    в blog:autocomplete, а не через istartswith; запрос целиком
+    считается началом строки. Связи из lookup_fields выбираются
+    через кэшируемый blog:autocomplete.
+    """
+
+    lookup_fields = {}
+
+    def get_search_results(self, request, queryset, search_term):
+        search_fields = self.get_search_fields(request)
+        term = search_term.strip()
+        if not term or not all(
+            field.startswith('^') for field in search_fields
+        ):
+            return super().get_search_results(
+                request, queryset, search_term
+            )
+        variants = prefix_variants(term)
+        return queryset.filter(reduce(or_, (
+            prefix_filter(field[1:], variants) for field in search_fields
+        ))), False
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        lookup = self.lookup_fields.get(db_field.name)
+        if lookup is not None and 'widget' not in kwargs:
+            kwargs['widget'] = LookupAutocompleteSelect(db_field, lookup)
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+
+class ChangeListOptimizationMixin:
+    """
+    Облегчённый список объектов в админке.
+
+    Текст обрезается в SQL, полный текст и его HTML в список не
+    загружаются, а число найденных объектов кэшируется по тексту запроса.
+    Сами строки не кэшируются: форма list_editable ждёт QuerySet.
+    """
+
+    show_full_result_count = False
+    count_cache_namespace = POSTS_NAMESPACE
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request).annotate(
+            short_text=Substr('text', 1, SHORT_TEXT_LENGTH)
+        )
+        if request.resolver_match.url_name.endswith('_changelist'):
+            queryset = queryset.defer('text', 'text_html')
+        return queryset
+
+    @admin.display(description='Текст', ordering='short_text')
+    def short_text(self, obj):
+        return obj.short_text
+
+    def get_paginator(self, request, queryset, per_page, **kwargs):
+        try:
+            sql, params = queryset.query.sql_with_params()
+        except EmptyResultSet:
+            return super().get_paginator(request, queryset, per_page, **kwargs)
+        digest = hashlib.sha1(repr((sql, params)).encode()).hexdigest()
+        return PostPaginator(
+            queryset,
+            per_page,
+            cache_key=f'admin:{digest}',
+            cache_namespace=self.count_cache_namespace,
+            cache_results=False,
+            **kwargs
+        )
 
 
 @admin.register(Post)
-class PostAdmin(admin.ModelAdmin):
+class PostAdmin(
+    PrefixLookupMixin, ChangeListOptimizationMixin, admin.ModelAdmin
+):
     list_display = (
         'title',
-        'text',
+        'short_text',
         'pub_date',
         'author',
         'location',
@@ -20,10 +125,105 @@ class PostAdmin(admin.ModelAdmin):
         'is_published',
     )
     list_display_links = ('title',)
+    list_select_related = ('author', 'location', 'category')
+    search_fields = ('^title', '^author__username')
+    lookup_fields = {
+        'author': 'user',
+        'location': 'location',
+        'category': 'category',
+    }
+    date_hierarchy = 'pub_date'
+    action_form = PostActionForm
+    actions = (
+        'publish_posts',
+        'unpublish_posts',
+        'recategorize_posts',
+        'delete_posts',
+    )
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        """
+        Категория в list_editable выводится обычным select.
+
+        Варианты загружаются один раз на запрос, а не по запросу
+        на каждую строку, как у виджета автодополнения.
+        """
+        in_changelist = request.resolver_match.url_name.endswith(
+            '_changelist'
+        )
+        if db_field.name == 'category' and in_changelist:
+            kwargs['widget'] = forms.Select
+        formfield = super().formfield_for_foreignkey(
+            db_field, request, **kwargs
+        )
+        if db_field.name == 'category' and in_changelist:
+            if not hasattr(request, '_category_choices'):
+                request._category_choices = list(formfield.choices)
+            formfield.choices = request._category_choices
+        return formfield
+
+    def _bulk_update(self, request, queryset, **values):
+        """Один UPDATE на все выбранные посты без вызова save()."""
+        with transaction.atomic():
+            posts = Post.objects.filter(pk__in=queryset.values('pk'))
+            author_ids = list(
+                posts.values_list('author_id', flat=True).distinct()
+            )
+            updated = posts.update(**values)
+            posts.refresh_visibility()
+        invalidate_posts(author_ids, visibility=True)
+        self.message_user(request, f'Изменено публикаций: {updated}.')
+
+    @admin.action(
+        description='Опубликовать выбранные публикации',
+        permissions=('change',),
+    )
+    def publish_posts(self, request, queryset):
+        self._bulk_update(request, queryset, is_published=True)
+
+    @admin.action(
+        description='Снять с публикации выбранные публикации',
+        permissions=('change',),
+    )
+    def unpublish_posts(self, request, queryset):
+        self._bulk_update(request, queryset, is_published=False)
+
+    @admin.action(
+        description='Перенести выбранные публикации в категорию',
+        permissions=('change',),
+    )
+    def recategorize_posts(self, request, queryset):
+        try:
+            category = self.action_form.base_fields['category'].clean(
+                request.POST.get('category')
+            )
+        except ValidationError:
+            category = None
+        if category is None:
+            self.message_user(
+                request, 'Выберите категорию.', level=messages.ERROR
+            )
+            return
+        self._bulk_update(request, queryset, category=category)
+
+    @admin.action(
+        description='Удалить выбранные публикации',
+        permissions=('delete',),
+    )
+    def delete_posts(self, request, queryset):
+        """
+        Мягкое удаление одним UPDATE.
+
+        Комментарии и файлы удаляет в фоне команда purge_deleted.
+        """
+        deleted, _ = Post.objects.filter(
+            pk__in=queryset.values('pk')
+        ).delete()
+        self.message_user(request, f'Удалено публикаций: {deleted}.')
 
 
 @admin.register(Location)
-class LocationAdmin(admin.ModelAdmin):
+class LocationAdmin(PrefixLookupMixin, admin.ModelAdmin):
     list_display = (
         'name',
         'is_published',
@@ -33,10 +233,11 @@ class LocationAdmin(admin.ModelAdmin):
         'is_published',
     )
     list_display_links = ('name',)
+    search_fields = ('^name',)
 
 
 @admin.register(Category)
-class CategoryAdmin(admin.ModelAdmin):
+class CategoryAdmin(PrefixLookupMixin, admin.ModelAdmin):
     list_display = (
         'title',
         'description',
@@ -48,16 +249,42 @@ class CategoryAdmin(admin.ModelAdmin):
         'is_published',
     )
     list_display_links = ('title',)
+    search_fields = ('^title',)
 
 
 @admin.register(Comment)
-class CommentAdmin(admin.ModelAdmin):
+class CommentAdmin(
+    PrefixLookupMixin, ChangeListOptimizationMixin, admin.ModelAdmin
+):
     list_display = (
-        'text',
+        'short_text',
         'post',
         'author',
     )
-    list_display_links = ('text',)
+    list_display_links = ('short_text',)
+    list_select_related = ('post', 'author')
+    search_fields = ('^author__username',)
+    autocomplete_fields = ('post',)
+    lookup_fields = {'author': 'user'}
+    date_hierarchy = 'created_at'
+    count_cache_namespace = LISTINGS_NAMESPACE
+
+
+class SoftDeleteUserAdmin(UserAdmin):
+    """
+    Пользователи удаляются мягко.
+
+    Учётная запись отключается, посты скрываются, а комментарии,
+    посты и сама запись удаляются в фоне командой purge_deleted.
+    """
+
+    def delete_model(self, request, obj):
+        soft_delete_users(User.objects.filter(pk=obj.pk))
+
+    def delete_queryset(self, request, queryset):
+        soft_delete_users(queryset)
 
 
+admin.site.unregister(User)
+admin.site.register(User, SoftDeleteUserAdmin)
 admin.site.empty_value_display = 'Не задано'
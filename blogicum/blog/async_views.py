@@ -0,0 +1,153 @@
+"""Асинхронные версии страниц чтения для развёртывания через ASGI."""
+
+from asgiref.sync import sync_to_async
+from django.core.paginator import InvalidPage
+from django.http import Http404
+from django.shortcuts import render
+from django.views import View
+
+from .forms import CommentForm
+from .models import Post, User
+from .paginators import PostPaginator
+from .stats import get_author_summary
+from .views import MAX_POSTS, get_published_category
+
+
+async def aget_object_or_404(queryset, **kwargs):
+    try:
+        return await queryset.aget(**kwargs)
+    except queryset.model.DoesNotExist:
+        raise Http404
+
+
+async def aget_user(request):
+    """Вычисляет ленивый request.user вне асинхронного потока."""
+    await sync_to_async(lambda: request.user.pk)()
+    return request.user
+
+
+def _get_page(paginator, number, strict):
+    """
+    Страница как в синхронных представлениях.
+
+    strict — как ListView: неверный номер даёт 404; иначе как
+    Paginator.get_page: первая или последняя страница.
+    """
+    if not strict:
+        page = paginator.get_page(number)
+    else:
+        try:
+            page = paginator.page(
+                paginator.num_pages if number == 'last' else int(number or 1)
+            )
+        except (ValueError, InvalidPage):
+            raise Http404
+    # Шаблон рендерится в асинхронном потоке и не может делать запросы.
+    page.object_list = list(page.object_list)
+    return page
+
+
+async def aget_paginated_posts(
+    request,
+    posts,
+    count=None,
+    count_queryset=None,
+    cache_key=None,
+    paginate_by=MAX_POSTS,
+    strict=False
+):
+    """
+    Страница постов для асинхронных представлений.
+
+    Число постов и строки страницы берутся через PostPaginator с теми
+    же кэшами, что и в синхронных представлениях.
+    """
+    paginator = PostPaginator(
+        posts,
+        paginate_by,
+        count=count,
+        count_queryset=count_queryset,
+        cache_key=cache_key
+    )
+    return await sync_to_async(_get_page)(
+        paginator, request.GET.get('page'), strict
+    )
+
+
+class AsyncPostListView(View):
+
+    async def get(self, request):
+        await aget_user(request)
+        page_obj = await aget_paginated_posts(
+            request,
+            Post.objects.get_posts(),
+            count_queryset=Post.objects.get_posts_for_count(),
+            cache_key='feed',
+            strict=True
+        )
+        return render(request, 'blog/index.html', {
+            'page_obj': page_obj,
+            'post_list': page_obj.object_list,
+        })
+
+
+async def category_posts(request, category_slug):
+    await aget_user(request)
+    category = await sync_to_async(get_published_category)(category_slug)
+    context = {
+        'page_obj': await aget_paginated_posts(
+            request,
+            category.posts.get_posts(),
+            count_queryset=category.posts.get_posts_for_count(),
+            cache_key=f'category:{category.pk}'
+        ),
+        'category': category,
+    }
+    return render(request, 'blog/category.html', context)
+
+
+class AsyncProfileUserView(View):
+
+    async def get(self, request, username):
+        user = await aget_user(request)
+        author = await aget_object_or_404(User.objects, username=username)
+        check_publication = user != author
+        summary = await sync_to_async(get_author_summary)(author.pk)
+        page_obj = await aget_paginated_posts(
+            request,
+            author.posts.get_posts(is_published=check_publication),
+            count=(
+                summary.published_post_count if check_publication
+                else summary.post_count
+            )
+        )
+        return render(request, 'blog/profile.html', {
+            'profile': author,
+            'user': author,
+            'object': author,
+            'summary': summary,
+            'page_obj': page_obj,
+        })
+
+
+class AsyncPostDetailView(View):
+
+    async def get(self, request, post_pk):
+        user = await aget_user(request)
+        post = await aget_object_or_404(
+            Post.objects.select_related('location', 'category', 'author'),
+            pk=post_pk
+        )
+        if user.pk != post.author_id:
+            post = await aget_object_or_404(
+                Post.objects.get_posts(comment_count=False), pk=post_pk
+            )
+        comments = [
+            comment async for comment in post.comments.get_comments()
+        ]
+        return render(request, 'blog/post_detail.html', {
+            'post': post,
+            'object': post,
+            'form': CommentForm(),
+            'comments': comments,
+        })
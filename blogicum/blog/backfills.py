@@ -0,0 +1,64 @@
+"""
+Реестр фоновых заполнений данных (backfill).
+
+Заполнение обрабатывает строки диапазонами первичного ключа, каждый
+диапазон — отдельной короткой транзакцией, вместо одного UPDATE на всю
+таблицу внутри миграции. Запускается командой backfill.
+"""
+from dataclasses import dataclass
+from typing import Callable
+
+from django.db.models import QuerySet
+
+from .models import Comment, Post
+
+
+@dataclass(frozen=True)
+class Backfill:
+    name: str
+    description: str
+    # Все строки, которые нужно обработать.
+    get_queryset: Callable[[], QuerySet]
+    # Обрабатывает строки одного диапазона и возвращает их число.
+    process: Callable[[QuerySet], int]
+
+
+BACKFILLS = {}
+
+
+def register(name, get_queryset):
+    """Декоратор: регистрирует функцию обработки диапазона строк."""
+    def decorator(process):
+        BACKFILLS[name] = Backfill(
+            name, (process.__doc__ or '').strip(), get_queryset, process
+        )
+        return process
+    return decorator
+
+
+@register('post_is_visible', lambda: Post.objects.all())
+def post_is_visible(posts):
+    """Пересчитывает Post.is_visible."""
+    return posts.refresh_visibility()
+
+
+def _rerender(queryset):
+    objects = list(queryset.only('text'))
+    for obj in objects:
+        obj.render_text()
+    queryset.model._base_manager.bulk_update(
+        objects, ('text_html', 'text_html_version')
+    )
+    return len(objects)
+
+
+@register('post_text_html', lambda: Post.all_objects.all())
+def post_text_html(posts):
+    """Перестраивает сохранённый HTML текстов постов."""
+    return _rerender(posts)
+
+
+@register('comment_text_html', lambda: Comment.objects.all())
+def comment_text_html(comments):
+    """Перестраивает сохранённый HTML текстов комментариев."""
+    return _rerender(comments)
@@ -0,0 +1,293 @@
+import hashlib
+import logging
+import math
+import random
+import pickle
+import threading
+import time
+from collections import Counter, OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import EmptyResultSet
+from django.utils.connection import ConnectionProxy
+
+
+# Кэш блога: псевдоним из BLOG_CACHE_ALIAS.
+cache = ConnectionProxy(caches, settings.BLOG_CACHE_ALIAS)
+
+# Число постов в лентах и сводки авторов.
+POSTS_NAMESPACE = 'posts'
+# Содержимое лент: посты, категории, места, комментарии, авторы.
+LISTINGS_NAMESPACE = 'listings'
+# Кэш страниц: версия входит в имя ключа, поэтому после смены
+# видимости постов прежние страницы не отдаются даже как устаревшие.
+PAGES_NAMESPACE = 'pages'
+
+# Сколько секунд устаревшая запись хранится после мягкого истечения.
+STALE_TIMEOUT = 60 * 10
+# Сколько секунд помнить, что compute вернул None (404, скрытая
+# страница): иначе каждый запрос ждал бы блокировку пересчёта.
+NEGATIVE_TIMEOUT = 5
+# Время жизни блокировки пересчёта.
+LOCK_TIMEOUT = 10
+# Сколько ждать чужого пересчёта, если отдать нечего.
+LOCK_WAIT = 2
+LOCK_POLL_INTERVAL = 0.05
+# Чем больше, тем раньше начинается вероятностное обновление.
+XFETCH_BETA = 1.0
+# Сколько секунд процесс доверяет запомненной версии пространства имён.
+LOCAL_VERSION_TTL = 1
+
+logger = logging.getLogger('blog.cache')
+
+_metrics = Counter()
+_metrics_lock = threading.Lock()
+_local_versions = {}
+
+
+def _version_key(namespace):
+    return f'blog:{namespace}:version'
+
+
+def get_version(namespace=POSTS_NAMESPACE):
+    """Текущая версия пространства имён кэша."""
+    key = _version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        # Начальная версия уникальна, чтобы после вытеснения ключа
+        # не подхватывались записи, сделанные под старой версией.
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def get_local_version(namespace):
+    """
+    Версия пространства имён, запомненная в процессе.
+
+    Запись в другом процессе становится видна не позже чем через
+    LOCAL_VERSION_TTL секунд, запись в этом процессе — сразу.
+    """
+    now = time.monotonic()
+    memo = _local_versions.get(namespace)
+    if memo is None or memo[1] < now:
+        memo = (get_version(namespace), now + LOCAL_VERSION_TTL)
+        _local_versions[namespace] = memo
+    return memo[0]
+
+
+def bump_version(*namespaces):
+    """Инвалидирует все ключи пространств имён."""
+    for namespace in namespaces:
+        _local_versions.pop(namespace, None)
+        try:
+            cache.incr(_version_key(namespace))
+        except ValueError:
+            cache.set(_version_key(namespace), time.time_ns(), timeout=None)
+
+
+def make_key(namespace, *parts):
+    """Ключ кэша, привязанный к версии пространства имён."""
+    suffix = ':'.join(str(part) for part in parts)
+    return f'blog:{namespace}:{get_version(namespace)}:{suffix}'
+
+
+def get_cached_result(queryset):
+    """
+    Результат запроса из кэша.
+
+    Ключ строится по тексту SQL с параметрами, поэтому одинаковые
+    запросы лент внутри интервала publication_now() делят одно
+    обращение к БД.
+    """
+    timeout = settings.BLOG_QUERY_CACHE_TIMEOUT
+    if not timeout:
+        return queryset
+    try:
+        sql, params = queryset.query.sql_with_params()
+    except EmptyResultSet:
+        return []
+    digest = hashlib.sha1(repr((sql, params)).encode()).hexdigest()
+    key = make_key(LISTINGS_NAMESPACE, 'result', digest)
+    result = cache.get(key)
+    if result is None:
+        result = list(queryset)
+        cache.set(key, result, timeout)
+    return result
+
+
+class LocalCache:
+    """
+    LRU в памяти процесса с ограничением по объёму и сроку жизни.
+
+    Объём записи оценивается по размеру её pickle, как если бы она
+    хранилась в общем кэше.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, version):
+        """(True, значение) для свежей записи той же версии."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            value, entry_version, expires, size = entry
+            if entry_version != version or expires < time.time():
+                del self._entries[key]
+                self.size -= size
+                return False, None
+            self._entries.move_to_end(key)
+            return True, value
+
+    def set(self, key, value, version, expires):
+        size = len(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= old[3]
+            self._entries[key] = (value, version, expires, size)
+            self.size += size
+            while self.size > self.max_bytes:
+                *_, evicted_size = self._entries.popitem(last=False)[1]
+                self.size -= evicted_size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+_local_cache = None
+
+
+def get_local_cache():
+    global _local_cache
+    if _local_cache is None:
+        _local_cache = LocalCache(settings.BLOG_LOCAL_CACHE_MAX_BYTES)
+    return _local_cache
+
+
+def clear_local_cache():
+    """Сбрасывает кэш процесса и запомненные версии."""
+    get_local_cache().clear()
+    _local_versions.clear()
+
+
+def _count(tier, event):
+    with _metrics_lock:
+        _metrics[tier, event] += 1
+
+
+def get_metrics():
+    """
+    Счётчики get_or_compute в процессе по уровням кэша.
+
+    Для каждого события — число обращений и доля от обращений
+    к этому уровню: {'local': {'hit': (10, 0.5), ...}, 'shared': ...}.
+    """
+    with _metrics_lock:
+        metrics = dict(_metrics)
+    tiers = {}
+    for (tier, event), count in sorted(metrics.items()):
+        tiers.setdefault(tier, {})[event] = count
+    return {
+        tier: {
+            event: (count, count / sum(events.values()))
+            for event, count in events.items()
+        }
+        for tier, events in tiers.items()
+    }
+
+
+def _store(key, compute, timeout, version):
+    start = time.monotonic()
+    value = compute()
+    delta = time.monotonic() - start
+    if value is None:
+        expires = time.time() + NEGATIVE_TIMEOUT
+        cache.set(key, (None, version, expires, delta), NEGATIVE_TIMEOUT)
+        return None, None
+    expires = time.time() + timeout
+    cache.set(key, (value, version, expires, delta), timeout + STALE_TIMEOUT)
+    return value, expires
+
+
+def _get_shared(key, compute, timeout, version):
+    """Значение из общего кэша и срок его свежести (None для старого)."""
+    lock_key = f'{key}:lock'
+    entry = cache.get(key)
+    if entry is not None:
+        value, entry_version, expires, delta = entry
+        early = delta * XFETCH_BETA * -math.log(1 - random.random())
+        if entry_version == version and time.time() + early < expires:
+            _count('shared', 'hit')
+            return value, None if value is None else expires
+        if not cache.add(lock_key, True, LOCK_TIMEOUT):
+            _count('shared', 'stale')
+            return value, None
+        _count('shared', 'refresh')
+        try:
+            return _store(key, compute, timeout, version)
+        finally:
+            cache.delete(lock_key)
+    _count('shared', 'miss')
+    deadline = time.monotonic() + LOCK_WAIT
+    while not cache.add(lock_key, True, LOCK_TIMEOUT):
+        if time.monotonic() > deadline:
+            logger.warning('%s: не дождались пересчёта', key)
+            return compute(), None
+        time.sleep(LOCK_POLL_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry[0], None
+    try:
+        entry = cache.get(key)
+        if entry is not None and entry[1] == version:
+            return entry[0], None if entry[0] is None else entry[2]
+        return _store(key, compute, timeout, version)
+    finally:
+        cache.delete(lock_key)
+
+
+def get_or_compute(namespace, name, compute, timeout, local=False):
+    """
+    Значение из кэша с защитой от одновременного пересчёта.
+
+    Запись хранит версию пространства имён и мягкий срок жизни.
+    Устаревшую запись (истёк срок или сменилась версия) пересчитывает
+    только процесс, взявший блокировку, остальные тем временем получают
+    старое значение. Незадолго до истечения запись обновляется заранее
+    с вероятностью, растущей по мере приближения срока (XFetch).
+    Если compute вернул None, это запоминается на NEGATIVE_TIMEOUT
+    секунд: вызывающие получают None сразу, не дожидаясь блокировки.
+
+    С local=True перед общим кэшем проверяется LRU процесса; в него
+    попадают только свежие значения, не дольше
+    BLOG_LOCAL_CACHE_TIMEOUT секунд и до смены версии.
+    """
+    key = f'blog:{namespace}:swr:{name}'
+    local_cache = get_local_cache() if local else None
+    if local_cache is not None:
+        found, value = local_cache.get(key, get_local_version(namespace))
+        if found:
+            _count('local', 'hit')
+            return value
+        _count('local', 'miss')
+    version = get_version(namespace)
+    value, expires = _get_shared(key, compute, timeout, version)
+    if local_cache is not None and expires is not None:
+        local_cache.set(
+            key,
+            value,
+            version,
+            min(expires, time.time() + settings.BLOG_LOCAL_CACHE_TIMEOUT)
+        )
+    return value
@@ -0,0 +1,254 @@
+"""
+Бэкенд кэша в отдельном файле SQLite.
+
+Общий для всех процессов-воркеров на одном сервере, когда нет Redis:
+файл открывается в режиме WAL (чтение не блокируется записью), у каждого
+потока своё соединение. Устаревшие записи удаляются по индексу срока
+жизни, при переполнении вытесняются давно не читавшиеся (LRU).
+
+    CACHES = {
+        'shared': {
+            'BACKEND': 'blog.cache_backends.SQLiteCache',
+            'LOCATION': BASE_DIR / 'cache.sqlite3',
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        },
+    }
+"""
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+
+# Время чтения обновляется не чаще, чтобы get не писал в файл каждый раз.
+ACCESS_RESOLUTION = 60
+# Проверять переполнение раз в столько записей одного потока.
+CULL_CHECK_INTERVAL = 64
+BUSY_TIMEOUT = 5
+# Ограничение SQLite на число параметров запроса.
+MAX_QUERY_PARAMS = 900
+
+SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS cache ('
+    'key TEXT PRIMARY KEY, value BLOB NOT NULL, '
+    'expires REAL, accessed REAL NOT NULL) WITHOUT ROWID',
+    'CREATE INDEX IF NOT EXISTS cache_expires ON cache (expires)',
+    'CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed)',
+)
+
+
+def _chunks(items, size=MAX_QUERY_PARAMS):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class SQLiteCache(BaseCache):
+    pickle_protocol = pickle.HIGHEST_PROTOCOL
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        self._path = str(location)
+        self._local = threading.local()
+
+    @property
+    def _connection(self):
+        local = self._local
+        # После fork соединение родителя использовать нельзя.
+        if getattr(local, 'pid', None) != os.getpid():
+            connection = sqlite3.connect(
+                self._path,
+                timeout=BUSY_TIMEOUT,
+                isolation_level=None,
+            )
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            for statement in SCHEMA:
+                connection.execute(statement)
+            local.connection = connection
+            local.pid = os.getpid()
+            local.writes = 0
+        return local.connection
+
+    def _write(self, sql_many, now=None):
+        """Выполняет запросы записи одной транзакцией."""
+        connection = self._connection
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            for sql, params in sql_many:
+                connection.execute(sql, params)
+            connection.execute('COMMIT')
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        self._local.writes += 1
+        if self._local.writes % CULL_CHECK_INTERVAL == 0:
+            self._cull(now or time.time())
+
+    def _dumps(self, value):
+        return pickle.dumps(value, self.pickle_protocol)
+
+    def _cull(self, now):
+        connection = self._connection
+        connection.execute('DELETE FROM cache WHERE expires < ?', (now,))
+        (count,) = connection.execute('SELECT COUNT(*) FROM cache').fetchone()
+        if count <= self._max_entries:
+            return
+        if self._cull_frequency == 0:
+            connection.execute('DELETE FROM cache')
+            return
+        connection.execute(
+            'DELETE FROM cache WHERE key IN ('
+            'SELECT key FROM cache ORDER BY accessed LIMIT ?)',
+            (count // self._cull_frequency,)
+        )
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return self._get_many([key]).get(key, default)
+
+    def get_many(self, keys, version=None):
+        key_map = {
+            self.make_and_validate_key(key, version=version): key
+            for key in keys
+        }
+        return {
+            key_map[key]: value
+            for key, value in self._get_many(list(key_map)).items()
+        }
+
+    def _get_many(self, keys):
+        now = time.time()
+        found = {}
+        touched = []
+        for chunk in _chunks(keys):
+            rows = self._connection.execute(
+                'SELECT key, value, expires, accessed FROM cache '
+                f'WHERE key IN ({", ".join("?" * len(chunk))})',
+                chunk
+            )
+            for key, value, expires, accessed in rows:
+                if expires is not None and expires < now:
+                    continue
+                found[key] = pickle.loads(value)
+                if now - accessed > ACCESS_RESOLUTION:
+                    touched.append(key)
+        if touched:
+            self._write(
+                (
+                    'UPDATE cache SET accessed = ? '
+                    f'WHERE key IN ({", ".join("?" * len(chunk))})',
+                    (now, *chunk)
+                )
+                for chunk in _chunks(touched)
+            )
+        return found
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.set_many({key: value}, timeout, version)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        now = time.time()
+        expires = self.get_backend_timeout(timeout)
+        self._write(
+            (
+                (
+                    'INSERT OR REPLACE INTO cache '
+                    '(key, value, expires, accessed) VALUES (?, ?, ?, ?)',
+                    (
+                        self.make_and_validate_key(key, version=version),
+                        self._dumps(value),
+                        expires,
+                        now,
+                    )
+                )
+                for key, value in data.items()
+            ),
+            now
+        )
+        return []
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        now = time.time()
+        expires = self.get_backend_timeout(timeout)
+        connection = self._connection
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            connection.execute(
+                'DELETE FROM cache WHERE key = ? AND expires < ?', (key, now)
+            )
+            added = connection.execute(
+                'INSERT OR IGNORE INTO cache '
+                '(key, value, expires, accessed) VALUES (?, ?, ?, ?)',
+                (key, self._dumps(value), expires, now)
+            ).rowcount == 1
+            connection.execute('COMMIT')
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        return added
+
+    def incr(self, key, delta=1, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        connection = self._connection
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            row = connection.execute(
+                'SELECT value FROM cache WHERE key = ? '
+                'AND (expires IS NULL OR expires >= ?)',
+                (key, time.time())
+            ).fetchone()
+            if row is None:
+                raise ValueError(f"Key '{key}' not found")
+            value = pickle.loads(row[0]) + delta
+            connection.execute(
+                'UPDATE cache SET value = ? WHERE key = ?',
+                (self._dumps(value), key)
+            )
+            connection.execute('COMMIT')
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        return value
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        now = time.time()
+        cursor = self._connection.execute(
+            'UPDATE cache SET expires = ?, accessed = ? WHERE key = ? '
+            'AND (expires IS NULL OR expires >= ?)',
+            (self.get_backend_timeout(timeout), now, key, now)
+        )
+        return cursor.rowcount == 1
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return self._connection.execute(
+            'SELECT 1 FROM cache WHERE key = ? '
+            'AND (expires IS NULL OR expires >= ?)',
+            (key, time.time())
+        ).fetchone() is not None
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return self._connection.execute(
+            'DELETE FROM cache WHERE key = ?', (key,)
+        ).rowcount == 1
+
+    def delete_many(self, keys, version=None):
+        keys = [self.make_and_validate_key(key, version=version)
+                for key in keys]
+        self._write(
+            (
+                f'DELETE FROM cache WHERE key IN '
+                f'({", ".join("?" * len(chunk))})',
+                chunk
+            )
+            for chunk in _chunks(keys)
+        )
+
+    def clear(self):
+        self._connection.execute('DELETE FROM cache')
@@ -0,0 +1,21 @@
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.utils import timezone
+
+
+def publication_now():
+    """
+    Текущее время, округлённое вниз до BLOG_PUBLICATION_CLOCK_BUCKET секунд.
+
+    Внутри одного интервала запросы лент получают одинаковый SQL,
+    поэтому их результат можно кэшировать.
+    """
+    now = timezone.now()
+    bucket = settings.BLOG_PUBLICATION_CLOCK_BUCKET
+    if not bucket:
+        return now
+    timestamp = now.timestamp()
+    return datetime.fromtimestamp(
+        timestamp - timestamp % bucket, tz=dt_timezone.utc
+    )
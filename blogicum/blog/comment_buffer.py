@@ -0,0 +1,118 @@
+import atexit
+import logging
+import threading
+from collections import Counter
+
+from django.db import DatabaseError, close_old_connections, transaction
+
+from .cache import LISTINGS_NAMESPACE, bump_version
+from .models import Comment
+from .stats import adjust_author_summary
+
+
+logger = logging.getLogger('blog.comment_buffer')
+
+
+class CommentBuffer:
+    """
+    Отложенная запись комментариев.
+
+    Комментарии копятся в памяти процесса и записываются одним
+    bulk_create, когда набирается max_size штук или через max_latency
+    секунд после первого комментария пачки.
+    """
+
+    def __init__(self, max_size, max_latency):
+        self.max_size = max_size
+        self.max_latency = max_latency
+        self._pending = []
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def add(self, comment):
+        with self._lock:
+            self._pending.append(comment)
+            if len(self._pending) >= self.max_size:
+                batch = self._take()
+            else:
+                batch = None
+                if self._timer is None:
+                    self._timer = threading.Timer(
+                        self.max_latency, self._flush_in_thread
+                    )
+                    self._timer.daemon = True
+                    self._timer.start()
+        if batch:
+            self.write(batch)
+
+    def flush(self):
+        with self._lock:
+            batch = self._take()
+        if batch:
+            self.write(batch)
+
+    def _take(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        return batch
+
+    def _flush_in_thread(self):
+        try:
+            self.flush()
+        except Exception:
+            # Исключение в потоке таймера никто больше не увидит.
+            logger.exception('Не удалось записать пачку комментариев')
+        finally:
+            close_old_connections()
+
+    @staticmethod
+    def write(batch):
+        """
+        Записывает пачку; если она не записалась целиком, комментарии
+        записываются по одному, чтобы один ошибочный не терял остальные.
+        """
+        for comment in batch:
+            comment.render_text()
+        try:
+            with transaction.atomic():
+                Comment.objects.bulk_create(batch)
+            written = batch
+        except DatabaseError:
+            logger.exception(
+                'Пачка из %d комментариев не записана, пишем по одному',
+                len(batch)
+            )
+            written = []
+            for comment in batch:
+                try:
+                    with transaction.atomic():
+                        Comment.objects.bulk_create([comment])
+                except DatabaseError:
+                    logger.exception(
+                        'Комментарий к посту %s от пользователя %s потерян',
+                        comment.post_id, comment.author_id
+                    )
+                else:
+                    written.append(comment)
+        if not written:
+            return
+        # bulk_create не отправляет post_save, кэши сбрасываются здесь.
+        bump_version(LISTINGS_NAMESPACE)
+        authors = Counter(comment.post.author_id for comment in written)
+        for author_id, count in authors.items():
+            adjust_author_summary(author_id, comment_count=count)
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_comment_buffer(max_size, max_latency):
+    global _buffer
+    with _buffer_lock:
+        if _buffer is None:
+            _buffer = CommentBuffer(max_size, max_latency)
+            atexit.register(_buffer.flush)
+    return _buffer
@@ -0,0 +1,109 @@
+"""
+Мягкое удаление постов и пользователей и фоновая очистка.
+
+Посты помечаются deleted_at, пользователи отключаются (is_active=False)
+и ставятся в очередь в TaskState. Команда purge_deleted затем удаляет
+комментарии, файлы, посты и самих пользователей небольшими пачками,
+каждая в своей транзакции, чтобы не держать блокировку записи SQLite.
+
+Мягко удаляет пользователей только админка (SoftDeleteUserAdmin) и
+soft_delete_users. Модель User встроенная, поэтому user.delete() в
+остальном коде по-прежнему удаляет посты и комментарии каскадом сразу;
+очередь purge_deleted такие id просто пропускает.
+"""
+import time
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from .cache import LISTINGS_NAMESPACE, bump_version
+from .models import Comment, Post, TaskState
+from .signals import remember_post_authors
+from .stats import refresh_author_summary
+
+
+PURGE_USERS_TASK = 'purge_users'
+
+User = get_user_model()
+
+
+def soft_delete_users(users):
+    """Отключает пользователей, скрывает их посты и ставит в очередь."""
+    with transaction.atomic():
+        user_ids = list(users.values_list('pk', flat=True))
+        User.objects.filter(pk__in=user_ids).update(is_active=False)
+        Post.objects.filter(author_id__in=user_ids).delete()
+        queued = TaskState.get_value(PURGE_USERS_TASK, [])
+        TaskState.set_value(
+            PURGE_USERS_TASK, sorted({*queued, *user_ids})
+        )
+    bump_version(LISTINGS_NAMESPACE)
+    return len(user_ids)
+
+
+def _delete_in_batches(queryset, batch_size, pause, on_batch=None):
+    """Удаляет строки запроса пачками по первичному ключу."""
+    model = queryset.model
+    deleted = 0
+    while True:
+        with transaction.atomic():
+            batch = list(queryset.values_list('pk', flat=True)[:batch_size])
+            if not batch:
+                return deleted
+            if on_batch is not None:
+                on_batch(batch)
+            # Базовый менеджер: у Post.objects delete() мягкое.
+            _, counts = model._base_manager.filter(pk__in=batch).delete()
+            deleted += counts.get(model._meta.label, 0)
+        time.sleep(pause)
+
+
+def _delete_images(post_ids):
+    """Удаляет файлы изображений после фиксации удаления строк."""
+    storage = Post._meta.get_field('image').storage
+    names = list(
+        Post.all_objects.filter(pk__in=post_ids)
+        .exclude(image='')
+        .values_list('image', flat=True)
+    )
+
+    def delete_files():
+        for name in names:
+            storage.delete(name)
+
+    # При откате строки остаются, и файлы должны остаться с ними.
+    transaction.on_commit(delete_files)
+
+
+def purge(batch_size, pause):
+    """Удаляет всё, что помечено удалённым; возвращает число строк."""
+    deleted_posts = Post.all_objects.filter(deleted_at__isnull=False)
+    user_ids = TaskState.get_value(PURGE_USERS_TASK, [])
+    comment_querysets = (
+        Comment.objects.filter(post__in=deleted_posts.values('pk')),
+        Comment.objects.filter(author_id__in=user_ids),
+    )
+    result = {'comments': 0}
+    for comments in comment_querysets:
+        with remember_post_authors(comments):
+            result['comments'] += _delete_in_batches(
+                comments, batch_size, pause
+            )
+    author_ids = set(
+        deleted_posts.values_list('author_id', flat=True).distinct()
+    )
+    result['posts'] = _delete_in_batches(
+        deleted_posts, batch_size, pause, on_batch=_delete_images
+    )
+    with transaction.atomic():
+        # Каскад здесь уже пуст: посты и комментарии удалены выше.
+        _, deleted = User.objects.filter(pk__in=user_ids).delete()
+        result['users'] = deleted.get(User._meta.label, 0)
+        TaskState.set_value(PURGE_USERS_TASK, [
+            user_id for user_id in TaskState.get_value(PURGE_USERS_TASK, [])
+            if user_id not in user_ids
+        ])
+    bump_version(LISTINGS_NAMESPACE)
+    for author_id in author_ids:
+        refresh_author_summary(author_id)
+    return result
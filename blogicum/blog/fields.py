@@ -0,0 +1,10 @@
+from django.db import models
+
+
+class RenderedHTMLField(models.TextField):
+    """Текстовое поле с HTML, построенным из другого поля модели."""
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('blank', True)
+        kwargs.setdefault('editable', False)
+        super().__init__(*args, **kwargs)
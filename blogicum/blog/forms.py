@@ -1,5 +1,6 @@
 from django import forms
 from .models import Post, Comment
+from .widgets import LookupAutocompleteSelect
 from django.contrib.auth.forms import UserChangeForm
 from django.contrib.auth.models import User
 
@@ -9,7 +10,13 @@ class PostForm(forms.ModelForm):
         model = Post
         exclude = ('author',)
         widgets = {
-            'pub_date': forms.DateInput(attrs={'type': 'date'})
+            'pub_date': forms.DateInput(attrs={'type': 'date'}),
+            'category': LookupAutocompleteSelect(
+                Post._meta.get_field('category'), 'category'
+            ),
+            'location': LookupAutocompleteSelect(
+                Post._meta.get_field('location'), 'location'
+            ),
         }
 
 
@@ -0,0 +1,90 @@
+import hashlib
+from functools import reduce
+from operator import or_
+
+from django.contrib.auth import get_user_model
+from django.db.models import Q
+
+from .cache import cache, make_key
+from .models import Category, Location
+
+
+LOOKUPS_NAMESPACE = 'lookups'
+LOOKUP_PAGE_SIZE = 20
+LOOKUP_TIMEOUT = 60 * 10
+
+# Имя поиска -> (объекты для выбора, индексированное поле для поиска
+# по префиксу, доступен ли поиск только персоналу).
+LOOKUPS = {
+    'category': (Category.objects.all(), 'title', False),
+    'location': (Location.objects.all(), 'name', False),
+    'user': (
+        get_user_model().objects.filter(is_active=True), 'username', True
+    ),
+}
+# Больше любого символа, с которого может продолжаться префикс.
+PREFIX_UPPER_BOUND = '\U0010ffff'
+
+
+def prefix_variants(term):
+    """
+    Написания префикса, которые ищутся вместе.
+
+    Это эвристика, а не поиск без учёта регистра: перебираются только
+    типичные написания, и «mcd» не найдёт «McDonald».
+    """
+    return sorted({
+        term, term.lower(), term.upper(), term.capitalize(), term.title()
+    })
+
+
+def prefix_filter(field, variants):
+    """
+    Поиск по началу строки диапазонами по индексу поля.
+
+    istartswith в SQLite не использует индекс и без учёта регистра
+    сравнивает только латиницу; диапазоны по написаниям префикса
+    работают по обычному индексу и для кириллицы.
+    """
+    return reduce(or_, (
+        Q(**{
+            f'{field}__gte': variant,
+            f'{field}__lt': variant + PREFIX_UPPER_BOUND,
+        })
+        for variant in variants
+    ))
+
+
+def search(lookup, term, page=1):
+    """
+    Поиск объектов по началу строки для виджетов автодополнения.
+
+    Возвращает словарь в формате select2; результат кэшируется
+    до изменения моделей поиска.
+    """
+    queryset, field, _ = LOOKUPS[lookup]
+    variants = prefix_variants(term.strip())
+    # Ввод пользователя в ключ не попадает: в нём могут быть пробелы
+    # и управляющие символы, а длина не ограничена.
+    digest = hashlib.sha1('\0'.join(variants).encode()).hexdigest()
+    key = make_key(LOOKUPS_NAMESPACE, lookup, page, digest)
+    result = cache.get(key)
+    if result is not None:
+        return result
+    offset = (page - 1) * LOOKUP_PAGE_SIZE
+    rows = list(
+        queryset.filter(
+            prefix_filter(field, variants)
+        ).order_by(field).values_list('pk', field)[
+            offset:offset + LOOKUP_PAGE_SIZE + 1
+        ]
+    )
+    result = {
+        'results': [
+            {'id': str(pk), 'text': text}
+            for pk, text in rows[:LOOKUP_PAGE_SIZE]
+        ],
+        'pagination': {'more': len(rows) > LOOKUP_PAGE_SIZE},
+    }
+    cache.set(key, result, LOOKUP_TIMEOUT)
+    return result
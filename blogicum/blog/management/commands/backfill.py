@@ -0,0 +1,100 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from blog.backfills import BACKFILLS
+from blog.models import TaskState
+
+
+def task_name(backfill):
+    return f'backfill:{backfill.name}'
+
+
+class Command(BaseCommand):
+    help = (
+        'Выполняет зарегистрированное заполнение данных диапазонами '
+        'первичного ключа. Прогресс сохраняется в TaskState, повторный '
+        'запуск продолжает с места остановки.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('name', nargs='?', help='Имя заполнения.')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=0.1,
+            help='Пауза между диапазонами, секунды.'
+        )
+        parser.add_argument(
+            '--restart',
+            action='store_true',
+            help='Начать заново, забыв сохранённый прогресс.'
+        )
+        parser.add_argument(
+            '--list',
+            action='store_true',
+            dest='list_tasks',
+            help='Показать заполнения.'
+        )
+
+    def handle(self, *args, name, batch_size, sleep, restart, list_tasks,
+               **options):
+        if list_tasks or name is None:
+            for backfill in BACKFILLS.values():
+                progress = TaskState.get_value(task_name(backfill), {})
+                status = 'готово' if progress.get('finished') else (
+                    f'до pk {progress["last_pk"]}' if progress
+                    else 'не запускалось'
+                )
+                self.stdout.write(
+                    f'{backfill.name}: {backfill.description} ({status})'
+                )
+            return
+        if name not in BACKFILLS:
+            raise CommandError(f'Нет заполнения {name!r}.')
+        self.run(BACKFILLS[name], batch_size, sleep, restart)
+
+    def run(self, backfill, batch_size, sleep, restart):
+        progress = {} if restart else TaskState.get_value(
+            task_name(backfill), {}
+        )
+        last_pk = progress.get('last_pk', 0)
+        done = progress.get('done', 0)
+        queryset = backfill.get_queryset().order_by('pk')
+        remaining = queryset.filter(pk__gt=last_pk).count()
+        processed = 0
+        start = time.monotonic()
+        while True:
+            upper = queryset.filter(pk__gt=last_pk).values_list(
+                'pk', flat=True
+            )[batch_size - 1:batch_size].first()
+            chunk = queryset.filter(pk__gt=last_pk)
+            if upper is not None:
+                chunk = chunk.filter(pk__lte=upper)
+            with transaction.atomic():
+                count = backfill.process(chunk)
+                if upper is None:
+                    upper = chunk.values_list('pk', flat=True).last()
+                finished = upper is None or count < batch_size
+                if upper is not None:
+                    last_pk = upper
+                done += count
+                TaskState.set_value(task_name(backfill), {
+                    'last_pk': last_pk, 'done': done, 'finished': finished
+                })
+            processed += count
+            self.report(processed, remaining, time.monotonic() - start)
+            if finished:
+                self.stdout.write(f'{backfill.name}: готово, строк {done}')
+                return
+            time.sleep(sleep)
+
+    def report(self, processed, remaining, elapsed):
+        rate = processed / elapsed if elapsed else 0
+        eta = (remaining - processed) / rate if rate else 0
+        self.stdout.write(
+            f'{processed}/{remaining} строк, {rate:,.0f} строк/с, '
+            f'осталось ~{max(eta, 0):.0f} с'
+        )
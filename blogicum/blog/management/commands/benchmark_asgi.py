@@ -0,0 +1,120 @@
+import asyncio
+import importlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from io import BytesIO
+from wsgiref.util import setup_testing_defaults
+
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from django.urls import clear_url_caches
+
+
+# Адрес клиента вне INTERNAL_IPS, чтобы не подключался debug toolbar.
+CLIENT_ADDR = '10.0.0.1'
+
+
+@contextmanager
+def use_async_views(enabled):
+    """Пересобирает URLconf с синхронными или асинхронными страницами."""
+    with override_settings(BLOG_ASYNC_VIEWS=enabled, DEBUG=False):
+        for module in ('blog.urls', 'blogicum.urls'):
+            importlib.reload(importlib.import_module(module))
+        clear_url_caches()
+        yield
+    for module in ('blog.urls', 'blogicum.urls'):
+        importlib.reload(importlib.import_module(module))
+    clear_url_caches()
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает пропускную способность WSGI с пулом потоков и ASGI '
+        'на медленных клиентах, которые читают ответ --read-delay секунд.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/')
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--concurrency', type=int, default=50)
+        parser.add_argument(
+            '--threads',
+            type=int,
+            default=8,
+            help='Размер пула потоков WSGI.'
+        )
+        parser.add_argument('--read-delay', type=float, default=1.0)
+
+    def handle(self, *args, **options):
+        with use_async_views(False):
+            wsgi_time = self.run_wsgi(**options)
+        self.report('WSGI', options['requests'], wsgi_time)
+        with use_async_views(True):
+            asgi_time = asyncio.run(self.run_asgi(**options))
+        self.report('ASGI', options['requests'], asgi_time)
+
+    def report(self, name, requests, elapsed):
+        self.stdout.write(
+            f'{name}: {requests} запросов за {elapsed:.2f} с, '
+            f'{requests / elapsed:.1f} запросов/с'
+        )
+
+    def run_wsgi(self, path, requests, threads, read_delay, **options):
+        application = WSGIHandler()
+
+        def slow_client(_):
+            environ = {
+                'PATH_INFO': path,
+                'REMOTE_ADDR': CLIENT_ADDR,
+                'wsgi.input': BytesIO(),
+            }
+            setup_testing_defaults(environ)
+            environ['HTTP_HOST'] = 'localhost'
+            response = application(environ, lambda status, headers: None)
+            try:
+                for _ in response:
+                    # Поток занят, пока клиент читает ответ.
+                    time.sleep(read_delay)
+            finally:
+                response.close()
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(slow_client, range(requests)))
+        return time.perf_counter() - start
+
+    async def run_asgi(self, path, requests, concurrency, read_delay,
+                       **options):
+        application = ASGIHandler()
+        semaphore = asyncio.Semaphore(concurrency)
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': 'GET',
+            'scheme': 'http',
+            'path': path,
+            'root_path': '',
+            'query_string': b'',
+            'headers': [(b'host', b'localhost')],
+            'client': (CLIENT_ADDR, 50000),
+            'server': ('localhost', 80),
+        }
+
+        async def receive():
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        async def send(message):
+            if message['type'] == 'http.response.body':
+                await asyncio.sleep(read_delay)
+
+        async def slow_client():
+            async with semaphore:
+                await application(dict(scope), receive, send)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(slow_client() for _ in range(requests)))
+        return time.perf_counter() - start
@@ -0,0 +1,72 @@
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand
+
+from blog.cache_backends import SQLiteCache
+
+
+# Размер значения, близкий к закэшированной странице ленты.
+PAGE_SIZE = 20 * 1024
+BATCH_SIZE = 10
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает SQLiteCache с FileBasedCache и LocMemCache на '
+        'типичных операциях кэша блога.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--operations', type=int, default=2000)
+        parser.add_argument('--keys', type=int, default=500)
+
+    def handle(self, *args, operations, keys, **options):
+        directory = Path(tempfile.mkdtemp())
+        params = {'OPTIONS': {'MAX_ENTRIES': keys * 2}}
+        backends = (
+            ('LocMemCache', LocMemCache('benchmark', params)),
+            ('FileBasedCache', FileBasedCache(directory / 'files', params)),
+            ('SQLiteCache', SQLiteCache(directory / 'cache.sqlite3', params)),
+        )
+        try:
+            for name, backend in backends:
+                self.stdout.write(name)
+                for operation, elapsed in self.run(backend, operations, keys):
+                    self.stdout.write(
+                        f'  {operation}: {operations / elapsed:,.0f} оп/с'
+                    )
+        finally:
+            shutil.rmtree(directory)
+
+    def run(self, backend, operations, keys):
+        """Время каждой операции; get_many и set_many — по числу ключей."""
+        page = 'x' * PAGE_SIZE
+        names = [f'key:{number % keys}' for number in range(operations)]
+        batches = [
+            names[start:start + BATCH_SIZE]
+            for start in range(0, operations, BATCH_SIZE)
+        ]
+        backend.set('version', 1, None)
+        steps = (
+            ('set', lambda: [backend.set(key, page) for key in names]),
+            ('get', lambda: [backend.get(key) for key in names]),
+            ('get_many', lambda: [
+                backend.get_many(batch) for batch in batches
+            ]),
+            ('set_many', lambda: [
+                backend.set_many(dict.fromkeys(batch, page))
+                for batch in batches
+            ]),
+            ('incr', lambda: [backend.incr('version') for _ in names]),
+            ('add', lambda: [backend.add(f'{key}:lock', True, 10)
+                             for key in names]),
+        )
+        for operation, step in steps:
+            start = time.perf_counter()
+            step()
+            yield operation, time.perf_counter() - start
@@ -0,0 +1,71 @@
+import time
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.template import Engine, RequestContext, engines
+from django.test import RequestFactory
+
+from blog.models import Post
+from blog.paginators import PostPage, PostPaginator
+from blog.views import MAX_POSTS
+
+
+# Шаблоны, в которых адреса строятся через {% fast_url %}.
+FAST_URL_TEMPLATES = (
+    'includes/header.html',
+    'includes/post_card.html',
+    'includes/category_link.html',
+)
+
+
+def build_engine(fast_url):
+    """
+    Копия движка шаблонов с кэширующим загрузчиком.
+
+    При fast_url=False в шаблонах {% fast_url %} заменяется на {% url %}.
+    """
+    engine = engines['django'].engine
+    overrides = {}
+    if not fast_url:
+        for name in FAST_URL_TEMPLATES:
+            source = engine.get_template(name).source
+            overrides[name] = source.replace('{% fast_url ', '{% url ')
+    return Engine(
+        dirs=engine.dirs,
+        loaders=[(
+            'django.template.loaders.cached.Loader',
+            [('django.template.loaders.locmem.Loader', overrides)]
+            + engine.loaders
+        )],
+        context_processors=engine.context_processors,
+        libraries=engine.libraries,
+        builtins=engine.builtins,
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает время рендера ленты (blog/index.html) '
+        'с {% url %} и {% fast_url %}.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--renders', type=int, default=500)
+
+    def handle(self, *args, renders, **options):
+        request = RequestFactory().get('/')
+        request.user = AnonymousUser()
+        posts = list(Post.objects.get_posts()[:MAX_POSTS])
+        paginator = PostPaginator(posts, MAX_POSTS, count=len(posts))
+        context = {'page_obj': PostPage(posts, 1, paginator)}
+        for name, fast_url in (('url', False), ('fast_url', True)):
+            template = build_engine(fast_url).get_template('blog/index.html')
+            template.render(RequestContext(request, context))
+            start = time.perf_counter()
+            for _ in range(renders):
+                template.render(RequestContext(request, context))
+            elapsed = time.perf_counter() - start
+            self.stdout.write(
+                f'{name}: {elapsed / renders * 1000:.2f} мс на рендер '
+                f'({len(posts)} постов, {renders} рендеров)'
+            )
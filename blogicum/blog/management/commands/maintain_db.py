@@ -0,0 +1,130 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections
+
+from blog.models import Category, Comment, Location, Post
+
+
+REPORTED_MODELS = (Post, Comment, Category, Location)
+
+
+class Command(BaseCommand):
+    help = (
+        'Обслуживание базы SQLite: ANALYZE и PRAGMA optimize, '
+        'инкрементальный VACUUM в пределах бюджета времени, размеры '
+        'таблиц и индексов и число строк.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument(
+            '--skip-analyze', action='store_true',
+            help='Не собирать статистику планировщика.'
+        )
+        parser.add_argument(
+            '--vacuum-budget',
+            type=float,
+            default=5.0,
+            help='Сколько секунд можно освобождать страницы.'
+        )
+        parser.add_argument(
+            '--vacuum-pages',
+            type=int,
+            default=100,
+            help='Страниц за один шаг инкрементального VACUUM.'
+        )
+        parser.add_argument(
+            '--enable-incremental',
+            action='store_true',
+            help='Включить auto_vacuum=INCREMENTAL (один полный VACUUM).'
+        )
+
+    def handle(self, *args, database, skip_analyze, vacuum_budget,
+               vacuum_pages, enable_incremental, **options):
+        connection = connections[database]
+        if connection.vendor != 'sqlite':
+            raise CommandError('Команда работает только с SQLite.')
+        with connection.cursor() as cursor:
+            if not skip_analyze:
+                self.analyze(cursor)
+            if enable_incremental:
+                self.enable_incremental(cursor)
+            self.vacuum(cursor, vacuum_budget, vacuum_pages)
+            self.report_sizes(cursor)
+        self.report_rows()
+
+    def pragma(self, cursor, name):
+        cursor.execute(f'PRAGMA {name}')
+        return cursor.fetchone()[0]
+
+    def analyze(self, cursor):
+        start = time.monotonic()
+        cursor.execute('ANALYZE')
+        cursor.execute('PRAGMA optimize')
+        self.stdout.write(
+            f'ANALYZE и PRAGMA optimize: {time.monotonic() - start:.2f} с'
+        )
+
+    def enable_incremental(self, cursor):
+        if self.pragma(cursor, 'auto_vacuum') == 2:
+            return
+        start = time.monotonic()
+        cursor.execute('PRAGMA auto_vacuum = INCREMENTAL')
+        # Режим auto_vacuum меняется только полной перестройкой файла.
+        cursor.execute('VACUUM')
+        self.stdout.write(
+            'Включён auto_vacuum=INCREMENTAL, полный VACUUM: '
+            f'{time.monotonic() - start:.2f} с'
+        )
+
+    def vacuum(self, cursor, budget, pages):
+        free = self.pragma(cursor, 'freelist_count')
+        if self.pragma(cursor, 'auto_vacuum') != 2:
+            self.stdout.write(
+                f'Свободных страниц: {free}. Инкрементальный VACUUM '
+                'недоступен: запустите с --enable-incremental.'
+            )
+            return
+        start = time.monotonic()
+        deadline = start + budget
+        released = 0
+        while free and time.monotonic() < deadline:
+            cursor.execute(f'PRAGMA incremental_vacuum({pages:d})')
+            cursor.fetchall()
+            left = self.pragma(cursor, 'freelist_count')
+            released += free - left
+            if left == free:
+                break
+            free = left
+        self.stdout.write(
+            f'Освобождено страниц: {released}, осталось свободных: {free}, '
+            f'{time.monotonic() - start:.2f} с'
+        )
+
+    def report_sizes(self, cursor):
+        page_size = self.pragma(cursor, 'page_size')
+        page_count = self.pragma(cursor, 'page_count')
+        self.stdout.write(f'Размер базы: {page_size * page_count:,} байт')
+        tables = [model._meta.db_table for model in REPORTED_MODELS]
+        placeholders = ', '.join(['%s'] * len(tables))
+        try:
+            cursor.execute(
+                'SELECT d.name, m.type, SUM(d.pgsize) FROM dbstat AS d '
+                'JOIN sqlite_master AS m ON m.name = d.name '
+                f'WHERE m.tbl_name IN ({placeholders}) '
+                'GROUP BY d.name ORDER BY m.tbl_name, m.type DESC, d.name',
+                tables
+            )
+        except OperationalError:
+            # SQLite без SQLITE_ENABLE_DBSTAT_VTAB: только общий размер.
+            self.stdout.write('Размеры таблиц недоступны: нет dbstat.')
+            return
+        for name, kind, size in cursor.fetchall():
+            self.stdout.write(f'  {kind} {name}: {size:,} байт')
+
+    def report_rows(self):
+        for model in REPORTED_MODELS:
+            # Строки мягко удалённых постов тоже занимают место.
+            count = model._base_manager.count()
+            self.stdout.write(f'{model._meta.db_table}: {count} строк')
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from blog.models import Post
+from blog.signals import invalidate_posts
+
+
+class Command(BaseCommand):
+    help = (
+        'Отмечает видимыми отложенные публикации, дата которых наступила. '
+        'Запускается периодически (например, из cron раз в минуту).'
+    )
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        with transaction.atomic():
+            posts = Post.objects.filter(
+                is_visible=False,
+                is_published=True,
+                category__is_published=True,
+                pub_date__lte=now,
+            )
+            author_ids = list(
+                posts.values_list('author_id', flat=True).distinct()
+            )
+            published = Post.objects.filter(
+                pk__in=posts.values('pk')
+            ).update(is_visible=True)
+        if published:
+            invalidate_posts(author_ids, visibility=True)
+        self.stdout.write(f'Опубликовано отложенных постов: {published}')
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from blog.deletion import purge
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет комментарии, файлы и строки мягко удалённых постов '
+        'и пользователей небольшими транзакциями.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument(
+            '--pause',
+            type=float,
+            default=0.05,
+            help='Пауза между пачками, секунды: даёт пройти другим записям.'
+        )
+
+    def handle(self, *args, batch_size, pause, **options):
+        result = purge(batch_size, pause)
+        self.stdout.write(
+            f'Удалено комментариев: {result["comments"]}, '
+            f'постов: {result["posts"]}, пользователей: {result["users"]}'
+        )
@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog.cache import LISTINGS_NAMESPACE, bump_version
+from blog.models import Comment, Post
+from blog.rendering import RENDERER_VERSION
+
+
+class Command(BaseCommand):
+    help = (
+        'Перестраивает сохранённый HTML текстов постов и комментариев, '
+        'построенный устаревшей версией рендера.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            dest='rerender_all',
+            help='Перестроить HTML всех записей, а не только устаревших.'
+        )
+
+    def handle(self, *args, batch_size, rerender_all, **options):
+        for model in (Post, Comment):
+            rendered = self.rerender(model, batch_size, rerender_all)
+            self.stdout.write(
+                f'{model._meta.verbose_name_plural}: перестроено {rendered}'
+            )
+        bump_version(LISTINGS_NAMESPACE)
+
+    def rerender(self, model, batch_size, rerender_all):
+        queryset = model.objects.order_by('pk').only('text')
+        if not rerender_all:
+            queryset = queryset.exclude(text_html_version=RENDERER_VERSION)
+        rendered = 0
+        last_pk = 0
+        while True:
+            batch = list(queryset.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                return rendered
+            for obj in batch:
+                obj.render_text()
+            with transaction.atomic():
+                model.objects.bulk_update(
+                    batch, ('text_html', 'text_html_version')
+                )
+            rendered += len(batch)
+            last_pk = batch[-1].pk
@@ -0,0 +1,104 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from blog.models import Post, TaskState
+from blog.signals import invalidate_posts, post_published
+
+
+TASK_NAME = 'run_scheduler'
+
+
+class Command(BaseCommand):
+    help = (
+        'Следит за отложенными публикациями: когда наступает pub_date, '
+        'отмечает посты видимыми и отправляет сигнал post_published. '
+        'Курсор (последние pub_date и id) хранится в TaskState, поэтому '
+        'после перезапуска события не теряются и не повторяются.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument(
+            '--max-sleep',
+            type=float,
+            default=60,
+            help='Не спать дольше, чтобы заметить новые отложенные посты.'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Обработать наступившие публикации и выйти.'
+        )
+
+    def handle(self, *args, batch_size, max_sleep, once, **options):
+        cursor = self.load_cursor()
+        while True:
+            close_old_connections()
+            while True:
+                batch = self.due_posts(cursor, batch_size)
+                if not batch:
+                    break
+                cursor = self.publish(batch)
+            if once:
+                return
+            time.sleep(self.seconds_to_next_event(max_sleep))
+
+    def load_cursor(self):
+        with transaction.atomic():
+            value = TaskState.get_value(TASK_NAME)
+            if value is None:
+                # Первый запуск: события только для будущих публикаций.
+                # Курсор сохраняется сразу, чтобы публикации, наступившие
+                # до первой пачки, не потерялись при перезапуске.
+                cursor = (timezone.now(), 0)
+                self.save_cursor(cursor)
+                return cursor
+        return parse_datetime(value['pub_date']), value['pk']
+
+    def save_cursor(self, cursor):
+        TaskState.set_value(TASK_NAME, {
+            'pub_date': cursor[0].isoformat(), 'pk': cursor[1]
+        })
+
+    def due_posts(self, cursor, batch_size):
+        pub_date, pk = cursor
+        return list(
+            Post.objects.filter(
+                Q(pub_date__gt=pub_date) | Q(pub_date=pub_date, pk__gt=pk),
+                pub_date__lte=timezone.now(),
+                is_published=True,
+                category__is_published=True,
+            ).order_by('pub_date', 'pk')[:batch_size]
+        )
+
+    def publish(self, batch):
+        with transaction.atomic():
+            Post.objects.filter(
+                pk__in=[post.pk for post in batch]
+            ).refresh_visibility()
+        invalidate_posts(
+            (post.author_id for post in batch), visibility=True
+        )
+        post_published.send(sender=Post, posts=batch)
+        # Курсор сохраняется после обработчиков: при сбое пачка
+        # будет отправлена повторно, но не потеряется.
+        cursor = (batch[-1].pub_date, batch[-1].pk)
+        self.save_cursor(cursor)
+        self.stdout.write(f'Опубликовано отложенных постов: {len(batch)}')
+        return cursor
+
+    def seconds_to_next_event(self, max_sleep):
+        now = timezone.now()
+        next_pub_date = Post.objects.filter(
+            pub_date__gt=now, is_published=True
+        ).order_by('pub_date').values_list('pub_date', flat=True).first()
+        if next_pub_date is None:
+            return max_sleep
+        wait = next_pub_date - now + timedelta(milliseconds=10)
+        return min(wait.total_seconds(), max_sleep)
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.16 on 2026-10-19 10:07
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def compute_is_visible(apps, schema_editor):
+    Category = apps.get_model('blog', 'Category')
+    Post = apps.get_model('blog', 'Post')
+    Post.objects.update(is_visible=models.ExpressionWrapper(
+        models.Q(is_published=True, pub_date__lte=timezone.now())
+        & models.Exists(Category.objects.filter(
+            pk=models.OuterRef('category_id'), is_published=True
+        )),
+        output_field=models.BooleanField()
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0010_text_html'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='is_visible',
+            field=models.BooleanField(default=False, editable=False, help_text='Пост и категория опубликованы, дата публикации наступила.', verbose_name='Виден в лентах'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['is_visible', '-pub_date'], name='post_visible_pub_date_idx'),
+        ),
+        migrations.RunPython(compute_is_visible, migrations.RunPython.noop),
+    ]
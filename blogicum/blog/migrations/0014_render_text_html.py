@@ -0,0 +1,44 @@
+from django.db import migrations
+
+from blog.rendering import RENDERER_VERSION, render_text
+
+
+BATCH_SIZE = 500
+
+
+def render_texts(apps, schema_editor):
+    """
+    HTML для записей, созданных до 0010.
+
+    На больших таблицах миграцию можно пропустить (--fake) и
+    заполнить HTML фоном: manage.py backfill post_text_html и
+    comment_text_html.
+    """
+    for model_name in ('Post', 'Comment'):
+        model = apps.get_model('blog', model_name)
+        stale = model._base_manager.exclude(
+            text_html_version=RENDERER_VERSION
+        ).order_by('pk').only('text')
+        last_pk = 0
+        while True:
+            batch = list(stale.filter(pk__gt=last_pk)[:BATCH_SIZE])
+            if not batch:
+                break
+            for obj in batch:
+                obj.text_html = render_text(obj.text)
+                obj.text_html_version = RENDERER_VERSION
+            model._base_manager.bulk_update(
+                batch, ('text_html', 'text_html_version')
+            )
+            last_pk = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0013_post_deleted_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(render_texts, migrations.RunPython.noop),
+    ]
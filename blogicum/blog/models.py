@@ -1,6 +1,10 @@
 from django.db import models
 from django.contrib.auth import get_user_model
-from blog.querysets import PostManager
+from django.utils import timezone
+from django.utils.safestring import mark_safe
+from blog.fields import RenderedHTMLField
+from blog.querysets import CommentManager, PostManager
+from blog.rendering import RENDERER_VERSION, render_text
 
 
 User = get_user_model()
@@ -24,9 +28,46 @@ class PublishedAndDateBaseModel(models.Model):
         abstract = True
 
 
+class RenderedTextBaseModel(models.Model):
+    """
+    Абстрактная модель.
+
+    Хранит HTML поля text, построенный при сохранении.
+    """
+
+    text_html = RenderedHTMLField('HTML текста')
+    text_html_version = models.PositiveSmallIntegerField(
+        'Версия HTML текста',
+        default=0,
+        editable=False
+    )
+
+    class Meta:
+        abstract = True
+
+    def render_text(self):
+        self.text_html = render_text(self.text)
+        self.text_html_version = RENDERER_VERSION
+
+    @property
+    def rendered_text(self):
+        if self.text_html_version == RENDERER_VERSION:
+            return mark_safe(self.text_html)
+        return render_text(self.text)
+
+    def save(self, *args, **kwargs):
+        self.render_text()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'text' in update_fields:
+            kwargs['update_fields'] = {
+                *update_fields, 'text_html', 'text_html_version'
+            }
+        super().save(*args, **kwargs)
+
+
 class Category(PublishedAndDateBaseModel):
 
-    title = models.CharField('Заголовок', max_length=256)
+    title = models.CharField('Заголовок', max_length=256, db_index=True)
     description = models.TextField('Описание')
     slug = models.SlugField(
         'Идентификатор',
@@ -46,7 +87,7 @@ class Category(PublishedAndDateBaseModel):
 
 
 class Location(PublishedAndDateBaseModel):
-    name = models.CharField('Название места', max_length=256)
+    name = models.CharField('Название места', max_length=256, db_index=True)
 
     class Meta:
         verbose_name = 'местоположение'
@@ -57,9 +98,9 @@ class Location(PublishedAndDateBaseModel):
         return self.name[:50]
 
 
-class Post(PublishedAndDateBaseModel):
+class Post(PublishedAndDateBaseModel, RenderedTextBaseModel):
 
-    title = models.CharField('Заголовок', max_length=256)
+    title = models.CharField('Заголовок', max_length=256, db_index=True)
     text = models.TextField('Текст')
     pub_date = models.DateTimeField(
         'Дата и время публикации',
@@ -86,19 +127,66 @@ class Post(PublishedAndDateBaseModel):
         verbose_name='Автор публикации'
     )
     image = models.ImageField('Фото', upload_to='post_images', blank=True)
+    is_visible = models.BooleanField(
+        'Виден в лентах',
+        default=False,
+        editable=False,
+        help_text='Пост и категория опубликованы, дата публикации наступила.'
+    )
+    deleted_at = models.DateTimeField(
+        'Удалено',
+        null=True,
+        blank=True,
+        editable=False,
+        db_index=True
+    )
     objects = PostManager()
+    all_objects = models.Manager()
 
     class Meta:
         default_related_name = 'posts'
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(fields=('-pub_date',), name='post_pub_date_idx'),
+            models.Index(
+                fields=('is_visible', '-pub_date'),
+                name='post_visible_pub_date_idx'
+            ),
+        )
 
     def __str__(self):
         return self.title[:50]
 
-
-class Comment(models.Model):
+    def compute_is_visible(self, now=None):
+        return bool(
+            self.is_published
+            and self.category_id is not None
+            and self.category.is_published
+            and self.pub_date <= (now or timezone.now())
+        )
+
+    def delete(self, *args, **kwargs):
+        """Мягкое удаление, см. PostQuerySet.delete."""
+        self.deleted_at = timezone.now()
+        self.is_visible = False
+        return Post.objects.filter(pk=self.pk).delete()
+
+    def save(self, *args, **kwargs):
+        # Прежнее значение неизвестно, если поле не загружено.
+        was_visible = self.__dict__.get('is_visible')
+        self.is_visible = (
+            self.deleted_at is None and self.compute_is_visible()
+        )
+        self._visibility_changed = was_visible != self.is_visible
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'is_visible'}
+        super().save(*args, **kwargs)
+
+
+class Comment(RenderedTextBaseModel):
     text = models.TextField('Текст')
     post = models.ForeignKey(
         Post,
@@ -111,12 +199,42 @@ class Comment(models.Model):
         on_delete=models.CASCADE,
         verbose_name='Автор комментария'
     )
+    objects = CommentManager()
 
     class Meta:
         default_related_name = 'comments'
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
         ordering = ('created_at',)
+        indexes = (
+            models.Index(
+                fields=('created_at',), name='comment_created_at_idx'
+            ),
+        )
 
     def __str__(self):
         return self.text[:50]
+
+
+class TaskState(models.Model):
+    """Сохранённое состояние фоновой задачи (например, курсор)."""
+
+    name = models.CharField('Задача', max_length=64, unique=True)
+    value = models.JSONField('Состояние', default=dict)
+    updated_at = models.DateTimeField('Обновлено', auto_now=True)
+
+    class Meta:
+        verbose_name = 'состояние задачи'
+        verbose_name_plural = 'Состояния задач'
+
+    def __str__(self):
+        return self.name
+
+    @classmethod
+    def get_value(cls, name, default=None):
+        state = cls.objects.filter(name=name).first()
+        return default if state is None else state.value
+
+    @classmethod
+    def set_value(cls, name, value):
+        cls.objects.update_or_create(name=name, defaults={'value': value})
@@ -0,0 +1,135 @@
+"""
+Кэширование страниц с дырами для персональных фрагментов.
+
+Страница рендерится один раз для всех пользователей: фрагменты в
+{% hole %} заменяются метками. При каждой отдаче метки заполняются
+фрагментами, отрендеренными для текущего запроса (меню пользователя,
+кнопки автора, форма комментария с CSRF-токеном). Страницы хранятся
+через get_or_compute в пространстве LISTINGS_NAMESPACE: после записи
+их пересчитывает один процесс, остальные отдают прежнюю версию.
+Исключение — смена видимости постов: она меняет версию PAGES_NAMESPACE
+в имени ключа, и скрытый пост не показывается из старой страницы.
+"""
+import hashlib
+import re
+from functools import wraps
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core import signing
+from django.http import HttpResponse
+from django.template import engines
+from django.template.context import make_context
+from django.template.response import SimpleTemplateResponse
+
+from .cache import (
+    LISTINGS_NAMESPACE, PAGES_NAMESPACE, get_or_compute, get_version
+)
+from .templatetags.blog_holes import HOLE_SALT, PUNCH_HOLES, HoleNode
+
+
+HOLE_RE = re.compile(r'<!--hole:([^>]+?)-->')
+# Параметры запроса, от которых зависит страница; остальные не входят
+# в ключ, иначе произвольные ?x=... заполняли бы кэш.
+CACHED_QUERY_PARAMS = ('page',)
+
+
+def page_cache_name(request):
+    query = urlencode(sorted(
+        (name, value)
+        for name in CACHED_QUERY_PARAMS
+        for value in request.GET.getlist(name)
+    ))
+    digest = hashlib.sha1(f'{request.path}?{query}'.encode()).hexdigest()
+    return f'page:{get_version(PAGES_NAMESPACE)}:{digest}'
+
+
+def _find_hole(template_name, name):
+    template = engines['django'].engine.get_template(template_name)
+    for node in template.nodelist.get_nodes_by_type(HoleNode):
+        if node.name == name:
+            return template, node
+    raise LookupError(f'{template_name}: нет {{% hole "{name}" %}}')
+
+
+def fill_holes(request, content):
+    """Рендерит фрагменты на месте меток для текущего запроса."""
+    holes = {}
+
+    def render_hole(match):
+        template_name, name, values = signing.loads(
+            match[1], salt=HOLE_SALT
+        )
+        if (template_name, name) not in holes:
+            holes[template_name, name] = _find_hole(template_name, name)
+        template, node = holes[template_name, name]
+        context = make_context(values, request)
+        with context.bind_template(template):
+            return node.nodelist.render(context)
+
+    return HOLE_RE.sub(render_hole, content)
+
+
+def cached_page(request, get_response, is_cacheable=None):
+    """
+    Отдаёт страницу из кэша или рендерит её с метками и кэширует.
+
+    get_response должен вернуть неотрендеренный TemplateResponse;
+    is_cacheable вызывается после него и может запретить кэширование.
+    """
+    if not settings.BLOG_PAGE_CACHE or request.method != 'GET':
+        return get_response()
+    response = None
+
+    def render_page():
+        nonlocal response
+        response = get_response()
+        if not (
+            isinstance(response, SimpleTemplateResponse)
+            and not response.is_rendered
+            and response.status_code == 200
+            and (is_cacheable is None or is_cacheable())
+        ):
+            return None
+        response.context_data = {
+            **(response.context_data or {}), PUNCH_HOLES: True
+        }
+        response.render()
+        return response.content.decode(response.charset)
+
+    content = get_or_compute(
+        LISTINGS_NAMESPACE,
+        page_cache_name(request),
+        render_page,
+        settings.BLOG_PAGE_CACHE_TIMEOUT
+    )
+    if content is None:
+        # Страница не кэшируется; если её рендерил не этот запрос,
+        # рендерим сами.
+        return get_response() if response is None else response
+    if response is None:
+        response = HttpResponse()
+    response.content = fill_holes(request, content)
+    return response
+
+
+def cache_page_with_holes(view):
+    """Декоратор функции-представления, см. cached_page."""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        return cached_page(request, lambda: view(request, *args, **kwargs))
+    return wrapper
+
+
+class PageCacheMixin:
+    """Миксин CBV, кэширующий страницу с дырами (см. cached_page)."""
+
+    def is_page_cacheable(self):
+        return True
+
+    def get(self, request, *args, **kwargs):
+        return cached_page(
+            request,
+            lambda: super(PageCacheMixin, self).get(request, *args, **kwargs),
+            self.is_page_cacheable
+        )
@@ -0,0 +1,93 @@
+from django.core.paginator import Page, Paginator
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+
+from .cache import (
+    POSTS_NAMESPACE, cache, get_cached_result, get_or_compute
+)
+
+
+COUNT_TIMEOUT = 60 * 5
+ESTIMATED_COUNT_TIMEOUT = 60 * 60
+ESTIMATE_THRESHOLD = 10_000
+PAGES_ON_EACH_SIDE = 2
+PAGES_ON_ENDS = 1
+
+
+class PostPage(Page):
+
+    @property
+    def elided_page_range(self):
+        """Первые/последние страницы и соседи текущей, с многоточиями."""
+        return self.paginator.get_elided_page_range(
+            self.number,
+            on_each_side=PAGES_ON_EACH_SIDE,
+            on_ends=PAGES_ON_ENDS,
+        )
+
+
+class PostPaginator(Paginator):
+    """
+    Пагинатор ленты постов.
+
+    Число постов можно передать заранее, посчитать по облегчённому
+    `count_queryset` или закэшировать по `cache_key`.
+    Точное значение пересчитывается после записи постов и категорий
+    одним процессом, остальные до этого видят прежнее;
+    для длинных лент (от ESTIMATE_THRESHOLD) хранится оценка, которая
+    не сбрасывается на запись и живёт ESTIMATED_COUNT_TIMEOUT.
+    Строки страницы кэшируются, если не передан `cache_results=False`:
+    тогда object_list страницы остаётся QuerySet.
+    """
+
+    def __init__(
+        self,
+        object_list,
+        per_page,
+        count=None,
+        count_queryset=None,
+        cache_key=None,
+        cache_namespace=POSTS_NAMESPACE,
+        cache_results=True,
+        **kwargs
+    ):
+        super().__init__(object_list, per_page, **kwargs)
+        self.cache_results = cache_results
+        self.count_queryset = count_queryset
+        self.cache_key = cache_key
+        self.cache_namespace = cache_namespace
+        if count is not None:
+            self.count = count
+
+    def _count(self):
+        if self.count_queryset is None:
+            return super().count
+        return self.count_queryset.count()
+
+    @cached_property
+    def count(self):
+        if self.cache_key is None:
+            return self._count()
+        estimated_key = f'blog:estimated-count:{self.cache_key}'
+        count = cache.get(estimated_key)
+        if count is not None:
+            return count
+
+        def compute():
+            count = self._count()
+            if count >= ESTIMATE_THRESHOLD:
+                cache.set(estimated_key, count, ESTIMATED_COUNT_TIMEOUT)
+            return count
+
+        return get_or_compute(
+            self.cache_namespace,
+            f'count:{self.cache_key}',
+            compute,
+            COUNT_TIMEOUT,
+            local=True
+        )
+
+    def _get_page(self, object_list, *args, **kwargs):
+        if self.cache_results and isinstance(object_list, QuerySet):
+            object_list = get_cached_result(object_list)
+        return PostPage(object_list, *args, **kwargs)
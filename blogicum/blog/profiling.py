@@ -0,0 +1,149 @@
+"""
+Профилирование рендера шаблонов.
+
+Включается настройкой BLOG_TEMPLATE_PROFILING. Когда она выключена,
+TemplateProfilingMiddleware исключает себя из цепочки и шаблонизатор
+не патчится.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.template.base import Template
+from django.template.defaulttags import URLNode
+from django.template.library import InclusionNode, SimpleNode
+
+
+logger = logging.getLogger('blog.profiling')
+
+REPORTS_TO_KEEP = 50
+
+_current_profile = ContextVar('template_profile', default=None)
+_reports = deque(maxlen=REPORTS_TO_KEEP)
+_patch_lock = threading.Lock()
+_patched = False
+
+
+@dataclass
+class Timing:
+    calls: int = 0
+    seconds: float = 0.0
+
+    @property
+    def milliseconds(self):
+        return self.seconds * 1000
+
+
+@dataclass
+class TemplateProfile:
+    """Время рендера шаблонов и тегов за один запрос (включая вложенные)."""
+
+    path: str
+    templates: dict = field(default_factory=dict)
+    tags: dict = field(default_factory=dict)
+    total: float = 0.0
+
+    def add(self, group, name, seconds):
+        timing = group.setdefault(name, Timing())
+        timing.calls += 1
+        timing.seconds += seconds
+
+    def top(self, group, limit=10):
+        return sorted(
+            group.items(), key=lambda item: item[1].seconds, reverse=True
+        )[:limit]
+
+    @property
+    def milliseconds(self):
+        return self.total * 1000
+
+    @property
+    def top_templates(self):
+        return self.top(self.templates)
+
+    @property
+    def top_tags(self):
+        return self.top(self.tags)
+
+
+def get_reports():
+    return list(reversed(_reports))
+
+
+def _timed(method, group_name, get_name):
+    @wraps(method)
+    def wrapper(self, context, *args, **kwargs):
+        profile = _current_profile.get()
+        if profile is None:
+            return method(self, context, *args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return method(self, context, *args, **kwargs)
+        finally:
+            profile.add(
+                getattr(profile, group_name),
+                get_name(self),
+                time.perf_counter() - start
+            )
+    return wrapper
+
+
+def _template_name(template):
+    return template.origin.template_name or template.origin.name
+
+
+def _tag_name(node):
+    if isinstance(node, URLNode):
+        return 'url'
+    return node.func.__name__
+
+
+def install():
+    """Оборачивает рендер шаблонов и тегов таймерами (один раз)."""
+    global _patched
+    with _patch_lock:
+        if _patched:
+            return
+        Template._render = _timed(
+            Template._render, 'templates', _template_name
+        )
+        for node_class in (URLNode, SimpleNode, InclusionNode):
+            node_class.render = _timed(node_class.render, 'tags', _tag_name)
+        _patched = True
+
+
+class TemplateProfilingMiddleware:
+
+    def __init__(self, get_response):
+        if not settings.BLOG_TEMPLATE_PROFILING:
+            raise MiddlewareNotUsed
+        install()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        profile = TemplateProfile(path=request.get_full_path())
+        token = _current_profile.set(profile)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current_profile.reset(token)
+        profile.total = time.perf_counter() - start
+        if profile.templates:
+            _reports.append(profile)
+            logger.info(
+                '%s: %.1f ms; %s',
+                profile.path,
+                profile.milliseconds,
+                ', '.join(
+                    f'{name} x{timing.calls} {timing.milliseconds:.1f} ms'
+                    for name, timing in profile.top(profile.templates, 5)
+                )
+            )
+        return response
@@ -1,9 +1,56 @@
-from django.db.models import Count
+from django.db.models import (
+    BooleanField, Count, Exists, ExpressionWrapper, OuterRef, Q
+)
 from django.db import models
 from django.utils import timezone
 
+from .clock import publication_now
 
-class PostManager(models.Manager):
+
+def visibility_expression(category_model, now):
+    """Условие видимости поста в лентах для UPDATE без JOIN."""
+    return ExpressionWrapper(
+        Q(is_published=True, pub_date__lte=now, deleted_at__isnull=True)
+        & Exists(
+            category_model.objects.filter(
+                pk=OuterRef('category_id'), is_published=True
+            )
+        ),
+        output_field=BooleanField()
+    )
+
+
+class PostQuerySet(models.QuerySet):
+
+    def delete(self):
+        """
+        Мягкое удаление: посты сразу пропадают из менеджера objects.
+
+        Комментарии и файлы удаляются позже пачками командой
+        purge_deleted, а не каскадом внутри запроса.
+        """
+        from .signals import invalidate_posts
+
+        author_ids = list(self.values_list('author_id', flat=True).distinct())
+        deleted = self.update(deleted_at=timezone.now(), is_visible=False)
+        invalidate_posts(author_ids, visibility=True)
+        return deleted, {self.model._meta.label: deleted}
+
+    delete.queryset_only = True
+
+    def refresh_visibility(self, now=None):
+        """Пересчитывает is_visible выбранных постов одним UPDATE."""
+        category_model = self.model._meta.get_field('category').related_model
+        return self.update(is_visible=visibility_expression(
+            category_model, now or timezone.now()
+        ))
+
+
+class PostManager(models.Manager.from_queryset(PostQuerySet)):
+    """Посты без удалённых; все строки доступны через Post.all_objects."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
 
     def get_posts(
         self,
@@ -13,10 +60,12 @@ class PostManager(models.Manager):
     ):
         posts = self
         if is_published:
+            # is_visible учитывает публикацию поста и категории;
+            # дата проверяется и здесь, пока publish_scheduled
+            # не отметил наступившие отложенные публикации.
             posts = posts.filter(
-                pub_date__lt=timezone.now(),
-                is_published=True,
-                category__is_published=True
+                is_visible=True,
+                pub_date__lt=publication_now()
             )
         if select_related:
             posts = posts.select_related(
@@ -29,3 +78,37 @@ class PostManager(models.Manager):
                 comment_count=Count('comments')
             ).order_by(*self.model._meta.ordering)
         return posts
+
+    def get_posts_for_count(self, is_published=True):
+        """
+        Запрос для подсчёта постов.
+
+        Без select_related, аннотации числа комментариев и сортировки,
+        то есть без JOIN.
+        """
+        return self.get_posts(
+            is_published=is_published,
+            select_related=False,
+            comment_count=False
+        ).order_by()
+
+
+class CommentManager(models.Manager):
+
+    def get_comments(self):
+        """
+        Комментарии для вывода ветки обсуждения.
+
+        Из автора загружается только username, сравнение с текущим
+        пользователем в шаблоне идёт по author_id. text нужен для
+        записей с устаревшим HTML: иначе rendered_text догружал бы его
+        отдельным запросом на каждый комментарий.
+        """
+        return self.select_related('author').only(
+            'text',
+            'text_html',
+            'text_html_version',
+            'created_at',
+            'post_id',
+            'author__username',
+        )
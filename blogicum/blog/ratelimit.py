@@ -0,0 +1,43 @@
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+def client_ip(request):
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def client_identity(request):
+    """
+    Кого ограничивать: пользователя, а анонима — по IP.
+
+    За прокси у всех запросов один REMOTE_ADDR, поэтому IP
+    вошедших пользователей не учитывается.
+    """
+    if request.user.is_authenticated:
+        return f'user:{request.user.pk}'
+    return f'ip:{client_ip(request)}'
+
+
+def is_rate_limited(scope, identities, limit, period):
+    """
+    Счётчик запросов в фиксированном окне длиной period секунд.
+
+    Каждый идентификатор (пользователь, IP) считается отдельно;
+    превышение лимита любым из них ограничивает запрос.
+    Счётчики хранятся в локальном кэше BLOG_RATELIMIT_CACHE.
+    """
+    cache = caches[settings.BLOG_RATELIMIT_CACHE]
+    window = int(time.time() // period)
+    limited = False
+    for identity in identities:
+        key = f'ratelimit:{scope}:{identity}:{window}'
+        cache.add(key, 0, period)
+        try:
+            count = cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, period)
+            count = 1
+        limited = limited or count > limit
+    return limited
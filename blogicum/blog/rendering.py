@@ -0,0 +1,11 @@
+from django.template.defaultfilters import linebreaksbr
+
+
+# Увеличьте при изменении render_text, чтобы перерисовать сохранённый
+# HTML командой `manage.py rerender_texts`.
+RENDERER_VERSION = 1
+
+
+def render_text(text):
+    """HTML для текста поста или комментария."""
+    return linebreaksbr(text)
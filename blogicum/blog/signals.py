@@ -0,0 +1,181 @@
+import threading
+from contextlib import contextmanager
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import (
+    post_delete, post_save, pre_delete, pre_save
+)
+from django.dispatch import Signal, receiver
+
+from .cache import (
+    LISTINGS_NAMESPACE, PAGES_NAMESPACE, POSTS_NAMESPACE, bump_version
+)
+from .lookups import LOOKUPS_NAMESPACE
+from .models import Category, Comment, Location, Post
+from .stats import adjust_author_summary, refresh_author_summary
+
+
+User = get_user_model()
+
+# Наступила дата публикации отложенных постов (run_scheduler);
+# аргумент posts — список постов одной пачки.
+post_published = Signal()
+
+
+# Авторы постов (post_id -> author_id), чьи комментарии удаляются
+# пачкой: каскадом или в purge_deleted. Без этого post_delete каждого
+# комментария искал бы автора поста отдельным запросом.
+_deleting = threading.local()
+
+
+def _known_post_authors():
+    if not hasattr(_deleting, 'post_authors'):
+        _deleting.post_authors = {}
+    return _deleting.post_authors
+
+
+def _remember(post_authors):
+    """Добавляет неизвестные пары и возвращает добавленные post_id."""
+    known = _known_post_authors()
+    added = post_authors.keys() - known.keys()
+    known.update((post_id, post_authors[post_id]) for post_id in added)
+    return added
+
+
+def _forget(post_ids):
+    known = _known_post_authors()
+    for post_id in post_ids:
+        known.pop(post_id, None)
+
+
+@contextmanager
+def remember_post_authors(comments):
+    """Авторы постов удаляемых комментариев одним запросом."""
+    added = _remember(dict(
+        comments.values_list('post_id', 'post__author_id').distinct()
+    ))
+    try:
+        yield
+    finally:
+        _forget(added)
+
+
+def _comment_post_author_id(comment):
+    if Comment.post.is_cached(comment):
+        return comment.post.author_id
+    known = _known_post_authors()
+    if comment.post_id in known:
+        return known[comment.post_id]
+    return Post.all_objects.filter(
+        pk=comment.post_id
+    ).values_list('author_id', flat=True).first()
+
+
+def invalidate_posts(author_ids, visibility=False):
+    """
+    Сбрасывает кэши после изменения постов перечисленных авторов.
+
+    visibility=True — посты могли появиться или пропасть из лент:
+    закэшированные страницы тогда не отдаются и как устаревшие.
+    """
+    bump_version(POSTS_NAMESPACE, LISTINGS_NAMESPACE)
+    if visibility:
+        bump_version(PAGES_NAMESPACE)
+    for author_id in set(author_ids):
+        refresh_author_summary(author_id)
+
+
+@receiver(pre_save, sender=Post)
+def post_saving(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Запоминает прежнего автора: его сводку тоже нужно сбросить."""
+    instance._previous_author_id = None
+    if raw or instance._state.adding:
+        return
+    if update_fields is not None and 'author' not in update_fields:
+        return
+    instance._previous_author_id = Post.all_objects.filter(
+        pk=instance.pk
+    ).values_list('author_id', flat=True).first()
+
+
+@receiver(pre_delete, sender=Post)
+def post_deleting(sender, instance, **kwargs):
+    instance._remembered = _remember({instance.pk: instance.author_id})
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def post_changed(sender, instance, raw=False, signal=None, **kwargs):
+    if raw:
+        # loaddata сохраняет объекты без вызова save().
+        Post.objects.filter(pk=instance.pk).refresh_visibility()
+    if signal is post_delete:
+        _forget(getattr(instance, '_remembered', ()))
+    author_ids = [instance.author_id]
+    previous_author_id = getattr(instance, '_previous_author_id', None)
+    if previous_author_id is not None:
+        author_ids.append(previous_author_id)
+    invalidate_posts(author_ids, visibility=(
+        raw
+        or signal is post_delete
+        or getattr(instance, '_visibility_changed', True)
+    ))
+
+
+@receiver(post_save, sender=Category)
+def category_saved(sender, instance, **kwargs):
+    instance.posts.refresh_visibility()
+    bump_version(
+        POSTS_NAMESPACE, LISTINGS_NAMESPACE, LOOKUPS_NAMESPACE, PAGES_NAMESPACE
+    )
+
+
+@receiver(pre_delete, sender=Category)
+def category_deleted(sender, instance, **kwargs):
+    # Посты остаются без категории (SET_NULL) и пропадают из лент.
+    instance.posts.update(is_visible=False)
+    bump_version(
+        POSTS_NAMESPACE, LISTINGS_NAMESPACE, LOOKUPS_NAMESPACE, PAGES_NAMESPACE
+    )
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def location_changed(sender, instance, **kwargs):
+    bump_version(LISTINGS_NAMESPACE, LOOKUPS_NAMESPACE)
+
+
+@receiver(pre_delete, sender=User)
+def user_deleting(sender, instance, **kwargs):
+    # Комментарии пользователя к чужим постам удалятся каскадом.
+    instance._remembered = _remember(dict(
+        Comment.objects.filter(author=instance)
+        .values_list('post_id', 'post__author_id')
+        .distinct()
+    ))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, update_fields=None, signal=None,
+                 **kwargs):
+    if signal is post_delete:
+        _forget(getattr(instance, '_remembered', ()))
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        return
+    bump_version(LISTINGS_NAMESPACE, LOOKUPS_NAMESPACE)
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, **kwargs):
+    bump_version(LISTINGS_NAMESPACE)
+    if created:
+        adjust_author_summary(
+            _comment_post_author_id(instance), comment_count=1
+        )
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    bump_version(LISTINGS_NAMESPACE)
+    adjust_author_summary(_comment_post_author_id(instance), comment_count=-1)
@@ -0,0 +1,85 @@
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Optional
+
+from django.db.models import Count, Max, Min, Q
+
+from .cache import POSTS_NAMESPACE, cache, make_key
+from .clock import publication_now
+
+
+AUTHOR_SUMMARY_TIMEOUT = 60 * 60
+
+
+@dataclass(frozen=True)
+class AuthorSummary:
+    """Сводка по автору для шапки профиля."""
+
+    post_count: int = 0
+    published_post_count: int = 0
+    comment_count: int = 0
+    last_post_date: Optional[datetime] = None
+    next_publication: Optional[datetime] = None
+
+    @property
+    def is_stale(self):
+        """Отложенная публикация уже вышла и счётчики устарели."""
+        return (
+            self.next_publication is not None
+            and self.next_publication <= publication_now()
+        )
+
+
+def _summary_key(author_id):
+    return make_key(POSTS_NAMESPACE, 'author', author_id)
+
+
+def compute_author_summary(author_id):
+    from .models import Comment, Post
+
+    now = publication_now()
+    # Те же условия, что в Post.objects.get_posts(): is_visible уже
+    # учитывает категорию, поэтому JOIN не нужен. Отложенные посты
+    # становятся видимыми в run_scheduler, который сбрасывает сводку.
+    visible = Q(is_visible=True)
+    stats = Post.objects.filter(author_id=author_id).aggregate(
+        post_count=Count('id'),
+        published_post_count=Count(
+            'id', filter=visible & Q(pub_date__lt=now)
+        ),
+        last_post_date=Max('pub_date', filter=visible & Q(pub_date__lt=now)),
+        next_publication=Min(
+            'pub_date', filter=visible & Q(pub_date__gte=now)
+        ),
+    )
+    stats['comment_count'] = Comment.objects.filter(
+        post__author_id=author_id, post__deleted_at__isnull=True
+    ).count()
+    return AuthorSummary(**stats)
+
+
+def get_author_summary(author_id):
+    """Сводка из кэша; при промахе считается одним набором агрегатов."""
+    key = _summary_key(author_id)
+    summary = cache.get(key)
+    if summary is None or summary.is_stale:
+        summary = compute_author_summary(author_id)
+        cache.set(key, summary, AUTHOR_SUMMARY_TIMEOUT)
+    return summary
+
+
+def refresh_author_summary(author_id):
+    cache.delete(_summary_key(author_id))
+
+
+def adjust_author_summary(author_id, **deltas):
+    """Инкрементально меняет счётчики закэшированной сводки."""
+    key = _summary_key(author_id)
+    summary = cache.get(key)
+    if summary is None:
+        return
+    changes = {
+        field: max(getattr(summary, field) + delta, 0)
+        for field, delta in deltas.items()
+    }
+    cache.set(key, replace(summary, **changes), AUTHOR_SUMMARY_TIMEOUT)
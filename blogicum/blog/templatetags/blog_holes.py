@@ -0,0 +1,69 @@
+from django import template
+from django.core import signing
+from django.template.base import Variable, VariableDoesNotExist
+
+
+register = template.Library()
+
+PUNCH_HOLES = 'punch_holes'
+HOLE_MARKER = '<!--hole:{}-->'
+HOLE_SALT = 'blog.holes'
+
+
+class HoleNode(template.Node):
+    """
+    Фрагмент страницы, который зависит от пользователя.
+
+    Обычно рендерится на месте. При кэшировании страницы вместо него
+    выводится метка с именем шаблона, именем дыры и значениями
+    перечисленных выражений; фрагмент рендерится заново при отдаче
+    страницы из кэша (см. blog.page_cache).
+    """
+
+    def __init__(self, name, expressions, nodelist):
+        self.name = name
+        self.expressions = expressions
+        self.nodelist = nodelist
+
+    def get_values(self, context):
+        """Значения выражений вложенными словарями: post.id -> {post: {id}}."""
+        values = {}
+        for expression in self.expressions:
+            try:
+                value = Variable(expression).resolve(context)
+            except VariableDoesNotExist:
+                value = None
+            *path, last = expression.split('.')
+            target = values
+            for part in path:
+                target = target.setdefault(part, {})
+            target[last] = value
+        return values
+
+    def render(self, context):
+        if not context.get(PUNCH_HOLES):
+            return self.nodelist.render(context)
+        return HOLE_MARKER.format(signing.dumps(
+            (self.origin.template_name, self.name, self.get_values(context)),
+            salt=HOLE_SALT,
+            compress=True,
+        ))
+
+
+@register.tag
+def hole(parser, token):
+    """{% hole "имя" post.id comment.author_id %}...{% endhole %}"""
+    bits = token.split_contents()
+    if len(bits) < 2 or bits[1][0] not in '"\'' or bits[1][-1] != bits[1][0]:
+        raise template.TemplateSyntaxError(
+            f'{bits[0]} ожидает имя в кавычках и список переменных.'
+        )
+    for expression in bits[2:]:
+        if not all(part.isidentifier() for part in expression.split('.')):
+            raise template.TemplateSyntaxError(
+                f'{bits[0]}: "{expression}" должно быть переменной без '
+                'фильтров.'
+            )
+    nodelist = parser.parse(('endhole',))
+    parser.delete_first_token()
+    return HoleNode(bits[1][1:-1], bits[2:], nodelist)
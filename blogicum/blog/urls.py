@@ -1,11 +1,23 @@
+from django.conf import settings
 from django.urls import path
 
-from . import views
+from . import async_views, views
 
 app_name = 'blog'
 
+if settings.BLOG_ASYNC_VIEWS:
+    index_view = async_views.AsyncPostListView.as_view()
+    profile_view = async_views.AsyncProfileUserView.as_view()
+    post_detail_view = async_views.AsyncPostDetailView.as_view()
+    category_posts_view = async_views.category_posts
+else:
+    index_view = views.PostListView.as_view()
+    profile_view = views.ProfileUserView.as_view()
+    post_detail_view = views.PostDetailView.as_view()
+    category_posts_view = views.category_posts
+
 urlpatterns = [
-    path('', views.PostListView.as_view(), name='index'),
+    path('', index_view, name='index'),
     path(
         'profile/edit_profile/',
         views.ProfileUpdateView.as_view(),
@@ -13,12 +25,12 @@ urlpatterns = [
     ),
     path(
         'profile/<str:username>/',
-        views.ProfileUserView.as_view(),
+        profile_view,
         name='profile'
     ),
     path(
         'posts/<int:post_pk>/',
-        views.PostDetailView.as_view(),
+        post_detail_view,
         name='post_detail'
     ),
     path(
@@ -38,7 +50,7 @@ urlpatterns = [
     ),
     path(
         'category/<slug:category_slug>/',
-        views.category_posts,
+        category_posts_view,
         name='category_posts'
     ),
     path(
@@ -56,4 +68,14 @@ urlpatterns = [
         views.CommentDeleteView.as_view(),
         name='delete_comment'
     ),
+    path(
+        'autocomplete/<slug:lookup>/',
+        views.autocomplete,
+        name='autocomplete'
+    ),
+    path(
+        'template-profile/',
+        views.template_profile,
+        name='template_profile'
+    ),
 ]
@@ -1,23 +1,49 @@
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.contrib.auth.decorators import login_required
+from django.http import Http404, JsonResponse
 from django.shortcuts import get_object_or_404, render, redirect
+from django.template.response import TemplateResponse
 from django.urls import reverse_lazy, reverse
 
 from django.contrib.auth.mixins import UserPassesTestMixin, LoginRequiredMixin
 
-from django.core.paginator import Paginator
 from django.views.generic import (
     CreateView, DeleteView, DetailView, ListView, UpdateView
 )
 
 from .models import Post, Category, User, Comment
+from .cache import LISTINGS_NAMESPACE, get_metrics, get_or_compute
+from .comment_buffer import get_comment_buffer
 from .forms import CommentForm, PostForm, BlogicumUserChangeForm
+from .lookups import LOOKUPS, search
+from .page_cache import PageCacheMixin, cache_page_with_holes
+from .paginators import PostPaginator
+from .profiling import get_reports
+from .ratelimit import client_identity, is_rate_limited
+from .stats import get_author_summary
 
 
 MAX_POSTS = 10
+CATEGORY_TIMEOUT = 60 * 60
 
 
-def get_paginated_posts(request, posts, paginate_by=MAX_POSTS):
+def get_paginated_posts(
+    request,
+    posts,
+    paginate_by=MAX_POSTS,
+    count=None,
+    count_queryset=None,
+    cache_key=None
+):
     """Функция для пагинации постов."""
-    return Paginator(posts, paginate_by).get_page(request.GET.get('page'))
+    return PostPaginator(
+        posts,
+        paginate_by,
+        count=count,
+        count_queryset=count_queryset,
+        cache_key=cache_key
+    ).get_page(request.GET.get('page'))
 
 
 class AuthorPostMixin:
@@ -57,6 +83,13 @@ class MainCommentMixin():
     model = Comment
     template_name = 'blog/add_comment.html'
 
+    def get_queryset(self):
+        # Комментарии удалённого поста ждут purge_deleted, но уже скрыты.
+        return Comment.objects.filter(
+            post_id=self.kwargs['post_pk'],
+            post__deleted_at__isnull=True
+        )
+
 
 class CreateUpdateCommentMixin(MainCommentMixin):
     """Миксин для создания и редактирования комментария."""
@@ -79,12 +112,18 @@ class ProfileUserView(DetailView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        author = self.get_object()
+        author = self.object
         check_publication = self.request.user != author
+        summary = get_author_summary(author.pk)
         context['profile'] = author
+        context['summary'] = summary
         context['page_obj'] = get_paginated_posts(
             self.request,
-            author.posts.get_posts(is_published=check_publication)
+            author.posts.get_posts(is_published=check_publication),
+            count=(
+                summary.published_post_count if check_publication
+                else summary.post_count
+            )
         )
         return context
 
@@ -103,7 +142,7 @@ class ProfileUpdateView(LoginRequiredMixin, OnlyAuthorMixin, UpdateView):
         return reverse('blog:profile', args=[self.request.user.username])
 
 
-class PostListView(ListView):
+class PostListView(PageCacheMixin, ListView):
     """CBV для страницы с постами."""
 
     model = Post
@@ -113,8 +152,17 @@ class PostListView(ListView):
     def get_queryset(self):
         return Post.objects.get_posts()
 
+    def get_paginator(self, queryset, per_page, **kwargs):
+        return PostPaginator(
+            queryset,
+            per_page,
+            count_queryset=Post.objects.get_posts_for_count(),
+            cache_key='feed',
+            **kwargs
+        )
+
 
-class PostDetailView(DetailView):
+class PostDetailView(PageCacheMixin, DetailView):
     """CBV для просмотра страницы поста."""
 
     model = Post
@@ -130,10 +178,18 @@ class PostDetailView(DetailView):
                 comment_count=False,
             ), pk=self.kwargs['post_pk'])
 
+    def is_page_cacheable(self):
+        """Страницу скрытого поста видит только автор, её не кэшируем."""
+        return self.request.user != self.object.author or (
+            Post.objects.get_posts(select_related=False, comment_count=False)
+            .filter(pk=self.object.pk)
+            .exists()
+        )
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['form'] = CommentForm()
-        context['comments'] = self.object.comments.select_related('author')
+        context['comments'] = self.object.comments.get_comments()
         context['post'] = self.object
         return context
 
@@ -186,8 +242,24 @@ class CommentCreateView(
     """CBV для создания комментария."""
 
     def form_valid(self, form):
+        limit, period = settings.BLOG_COMMENT_RATE_LIMIT
+        if is_rate_limited(
+            'comment',
+            (client_identity(self.request),),
+            limit,
+            period
+        ):
+            return render(self.request, 'pages/429.html', status=429)
         form.instance.author = self.request.user
-        form.instance.post = get_object_or_404(Post, pk=self.kwargs['post_pk'])
+        form.instance.post = get_object_or_404(
+            Post.objects.only('author_id'), pk=self.kwargs['post_pk']
+        )
+        if settings.BLOG_COMMENT_WRITE_BEHIND:
+            get_comment_buffer(
+                settings.BLOG_COMMENT_BATCH_SIZE,
+                settings.BLOG_COMMENT_BATCH_LATENCY
+            ).add(form.instance)
+            return redirect(self.get_success_url())
         return super().form_valid(form)
 
 
@@ -212,17 +284,54 @@ class CommentDeleteView(AuthorCommentMixin, MainCommentMixin, DeleteView):
         )
 
 
-def category_posts(request, category_slug):
-    category = get_object_or_404(
-        Category,
-        slug=category_slug,
-        is_published=True
+def get_published_category(slug):
+    """Опубликованная категория из кэша процесса или общего кэша."""
+    category = get_or_compute(
+        LISTINGS_NAMESPACE,
+        f'category:{slug}',
+        lambda: Category.objects.filter(
+            slug=slug, is_published=True
+        ).first(),
+        CATEGORY_TIMEOUT,
+        local=True
     )
+    if category is None:
+        raise Http404
+    return category
+
+
+@cache_page_with_holes
+def category_posts(request, category_slug):
+    category = get_published_category(category_slug)
     context = {
         'page_obj': get_paginated_posts(
             request,
-            category.posts.get_posts()
+            category.posts.get_posts(),
+            count_queryset=category.posts.get_posts_for_count(),
+            cache_key=f'category:{category.pk}'
         ),
         'category': category,
     }
-    return render(request, 'blog/category.html', context)
+    return TemplateResponse(request, 'blog/category.html', context)
+
+
+@login_required
+def autocomplete(request, lookup):
+    if lookup not in LOOKUPS or (
+        LOOKUPS[lookup][2] and not request.user.is_staff
+    ):
+        raise Http404
+    try:
+        page = max(int(request.GET.get('page', 1)), 1)
+    except ValueError:
+        page = 1
+    return JsonResponse(search(lookup, request.GET.get('term', ''), page))
+
+
+@staff_member_required
+def template_profile(request):
+    return render(request, 'blog/template_profile.html', {
+        'enabled': settings.BLOG_TEMPLATE_PROFILING,
+        'reports': get_reports(),
+        'cache_metrics': get_metrics(),
+    })
@@ -0,0 +1,19 @@
+from django.contrib import admin
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.urls import reverse
+
+
+class LookupAutocompleteSelect(AutocompleteSelect):
+    """
+    Select с подгрузкой вариантов через blog:autocomplete.
+
+    В разметку попадает только выбранный вариант, остальные
+    запрашиваются по мере ввода.
+    """
+
+    def __init__(self, field, lookup, attrs=None, **kwargs):
+        super().__init__(field, admin.site, attrs=attrs, **kwargs)
+        self.lookup = lookup
+
+    def get_url(self):
+        return reverse('blog:autocomplete', args=[self.lookup])
@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+
+# Типы содержимого, которые имеет смысл сжимать; картинки и архивы
+# уже сжаты.
+COMPRESSIBLE_TYPES = (
+    'text/',
+    'application/json',
+    'application/javascript',
+    'application/xml',
+    'image/svg+xml',
+)
+
+
+class ThresholdGZipMiddleware(GZipMiddleware):
+    """
+    Сжимает только текстовые ответы не короче GZIP_MIN_LENGTH байт.
+
+    Потоковые ответы отдают статику, которая выбирает заранее сжатую
+    копию сама, поэтому они не сжимаются.
+    """
+
+    def process_response(self, request, response):
+        content_type = response.get('Content-Type', '')
+        if (
+            response.streaming
+            or not content_type.startswith(COMPRESSIBLE_TYPES)
+            or len(response.content) < settings.GZIP_MIN_LENGTH
+        ):
+            return response
+        return super().process_response(request, response)
@@ -50,6 +50,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'blogicum.middleware.ThresholdGZipMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -57,6 +58,7 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'debug_toolbar.middleware.DebugToolbarMiddleware',
+    'blog.profiling.TemplateProfilingMiddleware',
 ]
 
 INTERNAL_IPS = [
@@ -98,6 +100,26 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'ratelimit': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'ratelimit',
+    },
+    # Shared by all worker processes on the host (no Redis needed).
+    'shared': {
+        'BACKEND': 'blog.cache_backends.SQLiteCache',
+        'LOCATION': BASE_DIR / 'cache.sqlite3',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
 
@@ -140,6 +162,21 @@ STATICFILES_DIRS = [
     BASE_DIR / 'static_dev',
 ]
 
+STATIC_ROOT = BASE_DIR / 'collected_static'
+
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': (
+            'django.contrib.staticfiles.storage.StaticFilesStorage'
+            if DEBUG
+            else 'blogicum.storage.CompressedManifestStaticFilesStorage'
+        ),
+    },
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/3.2/ref/settings/#default-auto-field
 
@@ -152,3 +189,53 @@ MEDIA_ROOT = BASE_DIR / 'media'
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
+
+# Blog performance settings
+
+# Seconds to round "now" down to in listing queries.
+BLOG_PUBLICATION_CLOCK_BUCKET = 60
+
+# Seconds to keep listing query results in cache; 0 disables the cache.
+BLOG_QUERY_CACHE_TIMEOUT = 60
+
+# Cache alias with per-process counters for rate limiting.
+BLOG_RATELIMIT_CACHE = 'ratelimit'
+
+# Comments allowed per user and per IP address: (count, seconds).
+BLOG_COMMENT_RATE_LIMIT = (10, 60)
+
+# Buffer new comments in memory and insert them in batches.
+BLOG_COMMENT_WRITE_BEHIND = False
+BLOG_COMMENT_BATCH_SIZE = 50
+# Seconds a buffered comment may wait before its batch is written.
+BLOG_COMMENT_BATCH_LATENCY = 0.5
+
+# Responses shorter than this many bytes are sent uncompressed.
+GZIP_MIN_LENGTH = 1024
+
+# Serve collected static files from Django when DEBUG is off and there is
+# no web server in front (compressed variants, far-future caching).
+BLOG_SERVE_STATIC = False
+
+# Use async versions of the feed, category, profile and post pages
+# (for ASGI deployments).
+BLOG_ASYNC_VIEWS = False
+
+# Record per-request template and tag render times (logged to
+# "blog.profiling" and shown to staff at /template-profile/).
+BLOG_TEMPLATE_PROFILING = False
+
+# Cache the feed, category and post pages once for all users; per-user
+# fragments marked with {% hole %} are rendered for every request.
+# Applies to the sync views only.
+BLOG_PAGE_CACHE = False
+BLOG_PAGE_CACHE_TIMEOUT = 300
+
+# Per-process LRU in front of the shared cache for category lookups and
+# listing counts: size budget in bytes (pickled) and lifetime in seconds.
+BLOG_LOCAL_CACHE_MAX_BYTES = 4 * 1024 * 1024
+BLOG_LOCAL_CACHE_TIMEOUT = 30
+
+# Cache alias used by the blog (counts, listings, pages, lookups); set to
+# 'shared' when running several worker processes.
+BLOG_CACHE_ALIAS = 'default'
@@ -0,0 +1,103 @@
+import mimetypes
+import posixpath
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.http import FileResponse, Http404
+from django.utils._os import safe_join
+from django.utils.cache import patch_cache_control, patch_vary_headers
+
+
+# Расширение сжатой копии -> значение Content-Encoding.
+ENCODINGS = (('.br', 'br'), ('.gz', 'gzip'))
+IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+DEFAULT_MAX_AGE = 60 * 5
+
+
+# (hashed_files хранилища, множество хешированных имён из него).
+_hashed_names = (None, frozenset())
+
+
+def is_hashed(path):
+    global _hashed_names
+    hashed_files = getattr(staticfiles_storage, 'hashed_files', None)
+    if hashed_files is None:
+        return False
+    if _hashed_names[0] is not hashed_files:
+        _hashed_names = (hashed_files, frozenset(hashed_files.values()))
+    return path in _hashed_names[1]
+
+
+def accepted_encodings(header):
+    """
+    Допустимые кодировки из Accept-Encoding по убыванию q.
+
+    Кодировки с q=0 исключаются; при равном q порядок ENCODINGS.
+    """
+    weights = {}
+    for item in header.split(','):
+        name, *params = (part.strip() for part in item.split(';'))
+        if not name:
+            continue
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        weights[name.lower()] = quality
+    default = weights.get('*', 0.0)
+    accepted = [
+        (suffix, name, weights.get(name, default))
+        for suffix, name in ENCODINGS
+    ]
+    return [
+        (suffix, name)
+        for suffix, name, quality in sorted(
+            accepted, key=lambda item: -item[2]
+        )
+        if quality > 0
+    ]
+
+
+def serve(request, path):
+    """
+    Раздача собранной статики из STATIC_ROOT.
+
+    Выбирает сжатую копию по Accept-Encoding, а файлам с хешем
+    в имени ставит кэширование на год.
+    """
+    path = posixpath.normpath(path).lstrip('/')
+    try:
+        fullpath = Path(safe_join(settings.STATIC_ROOT, path))
+    except ValueError:
+        raise Http404
+    if not fullpath.is_file():
+        raise Http404
+    content_type, _ = mimetypes.guess_type(str(fullpath))
+    filepath, encoding = fullpath, None
+    for suffix, name in accepted_encodings(
+        request.META.get('HTTP_ACCEPT_ENCODING', '')
+    ):
+        compressed = fullpath.with_name(fullpath.name + suffix)
+        if compressed.is_file():
+            filepath, encoding = compressed, name
+            break
+    response = FileResponse(
+        filepath.open('rb'),
+        filename=fullpath.name,
+        content_type=content_type or 'application/octet-stream'
+    )
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    patch_vary_headers(response, ('Accept-Encoding',))
+    if is_hashed(path):
+        patch_cache_control(
+            response, public=True, max_age=IMMUTABLE_MAX_AGE, immutable=True
+        )
+    else:
+        patch_cache_control(response, public=True, max_age=DEFAULT_MAX_AGE)
+    return response
@@ -0,0 +1,69 @@
+import gzip
+from io import BytesIO
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+COMPRESSIBLE_EXTENSIONS = (
+    '.css', '.js', '.map', '.svg', '.ico', '.txt', '.html', '.json', '.xml',
+)
+
+
+def gzip_compress(content):
+    buffer = BytesIO()
+    with gzip.GzipFile(
+        filename='', mode='wb', fileobj=buffer, compresslevel=9, mtime=0
+    ) as archive:
+        archive.write(content)
+    return buffer.getvalue()
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    Хранилище статики с хешами в именах и сжатыми копиями.
+
+    Для текстовых файлов рядом с хешированным именем при collectstatic
+    пишутся .gz и, если установлен пакет brotli, .br версии.
+    Ссылки sourceMappingURL не переписываются: карты исходников
+    в проекте не хранятся.
+    """
+
+    patterns = tuple(
+        (
+            extension,
+            tuple(
+                pattern for pattern in extension_patterns
+                if 'sourceMappingURL' not in str(pattern)
+            ),
+        )
+        for extension, extension_patterns
+        in ManifestStaticFilesStorage.patterns
+    )
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+        for name in self.hashed_files.values():
+            if name.endswith(COMPRESSIBLE_EXTENSIONS):
+                self.compress(name)
+
+    def compress(self, name):
+        with self.open(name) as original:
+            content = original.read()
+        compressors = [('.gz', gzip_compress)]
+        if brotli is not None:
+            compressors.append(('.br', brotli.compress))
+        for suffix, compressor in compressors:
+            compressed = compressor(content)
+            if len(compressed) >= len(content):
+                continue
+            if self.exists(name + suffix):
+                self.delete(name + suffix)
+            self._save(name + suffix, ContentFile(compressed))
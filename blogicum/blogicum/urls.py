@@ -1,5 +1,5 @@
 from django.contrib import admin
-from django.urls import include, path, reverse_lazy
+from django.urls import include, path, re_path, reverse_lazy
 from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib.auth.forms import UserCreationForm
@@ -25,6 +25,11 @@ urlpatterns = [
         name='registration',
     ),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+if settings.BLOG_SERVE_STATIC and not settings.DEBUG:
+    from blogicum.static import serve
+    urlpatterns.append(re_path(
+        r'^%s(?P<path>.*)$' % settings.STATIC_URL.lstrip('/'), serve
+    ))
 if settings.DEBUG:
     import debug_toolbar
     urlpatterns += (path('__debug__/', include(debug_toolbar.urls)),)
@@ -41,6 +41,17 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from blog.cache import cache, clear_local_cache
+
+    cache.clear()
+    clear_local_cache()
+    yield
+    cache.clear()
+    clear_local_cache()
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
@@ -0,0 +1,128 @@
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.admin import PostAdmin
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+CHANGELIST_URL = '/admin/blog/post/'
+
+
+@pytest.fixture
+def admin_client(client):
+    admin = get_user_model().objects.create_superuser(
+        'admin', 'admin@example.com', 'password'
+    )
+    client.force_login(admin)
+    return client
+
+
+def test_bulk_post_actions(admin_client, mixer):
+    posts = mixer.cycle(3).blend('blog.Post', is_published=True)
+    mixer.cycle(4).blend('blog.Comment', post=posts[0])
+    category = mixer.blend('blog.Category')
+    selected = [post.pk for post in posts[:2]]
+
+    admin_client.post(CHANGELIST_URL, {
+        'action': 'unpublish_posts', '_selected_action': selected
+    })
+    assert Post.objects.filter(is_published=False).count() == 2, (
+        'Убедитесь, что действие снятия с публикации обновляет '
+        'выбранные посты.'
+    )
+
+    admin_client.post(CHANGELIST_URL, {
+        'action': 'recategorize_posts',
+        '_selected_action': selected,
+        'category': category.pk,
+    })
+    assert Post.objects.filter(category=category).count() == 2
+
+    admin_client.post(CHANGELIST_URL, {
+        'action': 'delete_posts', '_selected_action': selected
+    })
+    assert Post.objects.count() == 1
+    assert Comment.objects.count() == 4, (
+        'Убедитесь, что комментарии удалённых постов удаляются в фоне.'
+    )
+    call_command('purge_deleted', pause=0, stdout=StringIO())
+    assert not Comment.objects.exists(), (
+        'Убедитесь, что при удалении постов удаляются их комментарии.'
+    )
+    assert Post.all_objects.count() == 1
+
+
+@pytest.mark.parametrize('url', [CHANGELIST_URL, '/admin/blog/comment/'])
+def test_changelist_query_count(admin_client, mixer, url,
+                                django_assert_max_num_queries):
+    posts = mixer.cycle(5).blend('blog.Post')
+    mixer.cycle(5).blend('blog.Comment', post=mixer.sequence(*posts))
+    admin_client.get(url)
+    with django_assert_max_num_queries(8):
+        response = admin_client.get(url)
+    assert response.status_code == 200
+
+
+def test_changelist_with_several_pages(admin_client, mixer, monkeypatch):
+    monkeypatch.setattr(PostAdmin, 'list_per_page', 2)
+    mixer.cycle(3).blend('blog.Post')
+    response = admin_client.get(CHANGELIST_URL)
+    assert response.status_code == 200, (
+        'Убедитесь, что список постов в админке открывается, '
+        'когда постов больше, чем помещается на страницу.'
+    )
+    Post.objects.update(title='Новый заголовок')
+    response = admin_client.get(CHANGELIST_URL)
+    assert 'Новый заголовок' in response.content.decode(), (
+        'Убедитесь, что строки списка в админке не берутся из кэша.'
+    )
+
+
+@pytest.mark.parametrize(
+    'action', ['publish_posts', 'unpublish_posts', 'recategorize_posts']
+)
+def test_view_only_staff_cannot_change_posts(client, mixer, action):
+    staff = mixer.blend(get_user_model(), is_staff=True)
+    staff.user_permissions.add(
+        Permission.objects.get(codename='view_post')
+    )
+    client.force_login(staff)
+    is_published = action != 'publish_posts'
+    posts = mixer.cycle(2).blend('blog.Post', is_published=is_published)
+    category = mixer.blend('blog.Category')
+    client.post(CHANGELIST_URL, {
+        'action': action,
+        '_selected_action': [post.pk for post in posts],
+        'category': category.pk,
+    })
+    assert set(
+        Post.objects.values_list('is_published', 'category_id')
+    ) == {(is_published, post.category_id) for post in posts}, (
+        'Убедитесь, что действия изменения постов в админке доступны '
+        'только с правом на изменение.'
+    )
+
+
+@pytest.mark.parametrize('url', [CHANGELIST_URL, '/admin/blog/comment/'])
+def test_changelist_does_not_load_full_text(admin_client, mixer, url):
+    mixer.blend('blog.Comment')
+    with CaptureQueriesContext(connection) as queries:
+        admin_client.get(url)
+    table = url.split('/')[-2]
+    selects = [
+        query['sql'] for query in queries.captured_queries
+        if f'FROM "blog_{table}"' in query['sql']
+        and 'COUNT(' not in query['sql']
+    ]
+    assert selects
+    for sql in selects:
+        assert f'"blog_{table}"."text_html"' not in sql, (
+            'Убедитесь, что список в админке не загружает HTML текста.'
+        )
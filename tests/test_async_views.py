@@ -0,0 +1,86 @@
+from datetime import timedelta
+from importlib import reload
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import clear_url_caches
+from django.utils import timezone
+
+import blog.urls
+from blog.models import Comment
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def async_views(settings):
+    settings.BLOG_ASYNC_VIEWS = True
+    reload(blog.urls)
+    clear_url_caches()
+    yield
+    settings.BLOG_ASYNC_VIEWS = False
+    reload(blog.urls)
+    clear_url_caches()
+
+
+@pytest.fixture
+def posts(mixer, user):
+    return mixer.cycle(3).blend(
+        'blog.Post', author=user, is_published=True,
+        category__is_published=True,
+        pub_date=timezone.now() - timedelta(days=1),
+    )
+
+
+def test_async_views_render(client, posts, user):
+    post = posts[0]
+    for url in (
+        '/',
+        f'/category/{post.category.slug}/',
+        f'/profile/{user.username}/',
+        f'/posts/{post.id}/',
+    ):
+        response = client.get(url)
+        assert response.status_code == 200
+        assert post.title in response.content.decode(), (
+            f'Убедитесь, что асинхронная страница {url} выводит пост.'
+        )
+
+
+@pytest.mark.parametrize('page, status', [
+    ('1', 200), ('last', 200), ('abc', 404), ('99', 404),
+])
+def test_async_feed_invalid_page(client, posts, page, status):
+    assert client.get('/', {'page': page}).status_code == status, (
+        'Убедитесь, что асинхронная лента обрабатывает номер страницы '
+        'так же, как синхронная.'
+    )
+
+
+def test_async_category_page_falls_back(client, posts):
+    url = f'/category/{posts[0].category.slug}/'
+    assert client.get(url, {'page': '99'}).status_code == 200
+    assert client.get('/category/unknown/').status_code == 404
+
+
+def test_async_feed_uses_cache(client, posts):
+    client.get('/')
+    with CaptureQueriesContext(connection) as queries:
+        assert client.get('/').status_code == 200
+    assert not any(
+        'FROM "blog_post"' in query['sql']
+        for query in queries.captured_queries
+    ), 'Убедитесь, что асинхронная лента берёт число и строки из кэша.'
+
+
+def test_async_post_with_stale_comment_html(client, posts, mixer):
+    post = posts[0]
+    mixer.blend('blog.Comment', post=post, text='один\nдва')
+    Comment.objects.update(text_html='', text_html_version=0)
+    response = client.get(f'/posts/{post.id}/')
+    assert response.status_code == 200, (
+        'Убедитесь, что асинхронная страница поста выводит комментарии '
+        'с устаревшим HTML.'
+    )
+    assert 'один<br>два' in response.content.decode()
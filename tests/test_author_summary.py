@@ -0,0 +1,83 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.models import Comment, Post
+from blog.stats import get_author_summary
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_summary_in_profile_context(user, user_client, mixer):
+    post = mixer.blend(
+        'blog.Post', author=user, category__is_published=True,
+        is_published=True,
+    )
+    mixer.cycle(2).blend('blog.Comment', post=post)
+    response = user_client.get(f'/profile/{user.username}/')
+    summary = response.context['summary']
+    assert summary.post_count == 1
+    assert summary.comment_count == 2
+
+
+def test_summary_updates_on_comment(user, user_client, mixer):
+    post = mixer.blend('blog.Post', author=user)
+    user_client.get(f'/profile/{user.username}/')
+    mixer.blend('blog.Comment', post=post)
+    response = user_client.get(f'/profile/{user.username}/')
+    assert response.context['summary'].comment_count == 1, (
+        'Убедитесь, что сводка автора обновляется при добавлении комментария.'
+    )
+
+
+def test_summary_refreshed_for_previous_author(
+    user, another_user, mixer
+):
+    post = mixer.blend('blog.Post', author=user)
+    assert get_author_summary(user.pk).post_count == 1
+    post.author = another_user
+    post.save()
+    assert get_author_summary(user.pk).post_count == 0, (
+        'Убедитесь, что при смене автора поста сбрасывается сводка '
+        'прежнего автора.'
+    )
+
+
+def test_cascade_delete_does_not_query_post_per_comment(
+    user, another_user, mixer
+):
+    own_post = mixer.blend('blog.Post', author=user)
+    other_post = mixer.blend('blog.Post', author=another_user)
+    mixer.cycle(5).blend('blog.Comment', post=own_post, author=another_user)
+    mixer.cycle(5).blend('blog.Comment', post=other_post, author=user)
+    with CaptureQueriesContext(connection) as queries:
+        user.delete()
+    lookups = [
+        query for query in queries.captured_queries
+        if query['sql'].startswith('SELECT "blog_post"."author_id"')
+    ]
+    assert not lookups, (
+        'Убедитесь, что при каскадном удалении автор поста не ищется '
+        'отдельным запросом для каждого комментария.'
+    )
+    assert not Comment.objects.exists()
+
+
+def test_summary_counts_visible_posts(user, another_user_client, mixer):
+    mixer.blend(
+        'blog.Post', author=user, is_published=True,
+        category__is_published=True,
+        pub_date=timezone.now() - timedelta(days=1),
+    )
+    # Дата наступила, но publish_scheduled ещё не отметил пост.
+    Post.objects.update(is_visible=False)
+    response = another_user_client.get(f'/profile/{user.username}/')
+    summary = response.context['summary']
+    page_obj = response.context['page_obj']
+    assert summary.published_post_count == len(page_obj.object_list) == 0, (
+        'Убедитесь, что сводка автора считает посты так же, как лента '
+        'профиля.'
+    )
@@ -0,0 +1,101 @@
+import warnings
+
+import pytest
+from django.core.cache import CacheKeyWarning
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_autocomplete_prefix_search(user_client, mixer):
+    mixer.blend('blog.Location', name='Москва')
+    mixer.blend('blog.Location', name='Мурманск')
+    mixer.blend('blog.Location', name='Казань')
+    response = user_client.get(
+        '/autocomplete/location/', {'term': 'М'}
+    )
+    assert response.status_code == 200
+    names = [item['text'] for item in response.json()['results']]
+    assert names == ['Москва', 'Мурманск'], (
+        'Убедитесь, что автодополнение ищет места по началу названия.'
+    )
+
+
+def test_autocomplete_unknown_lookup(user_client):
+    assert user_client.get('/autocomplete/unknown/').status_code == 404
+
+
+def test_create_form_does_not_render_all_locations(user_client, mixer):
+    mixer.cycle(5).blend('blog.Location')
+    content = user_client.get('/posts/create/').content.decode()
+    assert content.count('<option') <= 2, (
+        'Убедитесь, что форма публикации не выводит все места в <select>.'
+    )
+
+
+@pytest.mark.parametrize('terms', [('мос', 'Мос'), ('Мос', 'мос')])
+def test_autocomplete_is_case_insensitive(user_client, mixer, terms):
+    mixer.blend('blog.Location', name='Москва')
+    for term in terms:
+        response = user_client.get('/autocomplete/location/', {'term': term})
+        names = [item['text'] for item in response.json()['results']]
+        assert names == ['Москва'], (
+            'Убедитесь, что автодополнение не зависит от регистра '
+            'и не отдаёт из кэша результат другого написания.'
+        )
+
+
+def test_user_lookup_is_staff_only(user_client, user):
+    assert user_client.get('/autocomplete/user/').status_code == 404, (
+        'Убедитесь, что список пользователей доступен только персоналу.'
+    )
+
+
+def test_user_lookup_skips_inactive_users(client, mixer):
+    staff = mixer.blend('auth.User', username='staff', is_staff=True)
+    mixer.blend('auth.User', username='sleeping', is_active=False)
+    client.force_login(staff)
+    response = client.get('/autocomplete/user/', {'term': 's'})
+    names = [item['text'] for item in response.json()['results']]
+    assert names == ['staff'], (
+        'Убедитесь, что автодополнение не предлагает отключённых '
+        'пользователей.'
+    )
+
+
+def test_autocomplete_key_does_not_contain_term(user_client):
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', CacheKeyWarning)
+        response = user_client.get(
+            '/autocomplete/location/', {'term': 'a b\n' * 100}
+        )
+    assert response.status_code == 200, (
+        'Убедитесь, что введённый текст не попадает в ключ кэша как есть.'
+    )
+
+
+def test_admin_search_uses_prefix_ranges(client, mixer):
+    admin = mixer.blend('auth.User', is_staff=True, is_superuser=True)
+    client.force_login(admin)
+    mixer.blend('blog.Location', name='Москва')
+    mixer.blend('blog.Location', name='Казань')
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get('/admin/blog/location/', {'q': 'мос'})
+    assert list(response.context['cl'].result_list.values_list(
+        'name', flat=True
+    )) == ['Москва']
+    assert not any('LIKE' in query['sql'] for query in queries), (
+        'Убедитесь, что поиск в админке идёт по индексу, а не через LIKE.'
+    )
+
+
+def test_admin_post_form_uses_cached_lookups(client, mixer):
+    admin = mixer.blend('auth.User', is_staff=True, is_superuser=True)
+    client.force_login(admin)
+    content = client.get('/admin/blog/post/add/').content.decode()
+    for lookup in ('user', 'location', 'category'):
+        assert f'data-ajax--url="/autocomplete/{lookup}/"' in content, (
+            'Убедитесь, что форма поста в админке подгружает варианты '
+            'через кэшируемое автодополнение.'
+        )
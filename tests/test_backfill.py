@@ -0,0 +1,36 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from blog.models import Post, TaskState
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_backfill_resumes(mixer, monkeypatch):
+    posts = mixer.cycle(5).blend(
+        'blog.Post', is_published=True, category__is_published=True
+    )
+    Post.objects.update(is_visible=False)
+    TaskState.set_value(
+        'backfill:post_is_visible', {'last_pk': posts[1].pk, 'done': 2}
+    )
+    monkeypatch.setattr('time.sleep', lambda seconds: None)
+    out = StringIO()
+    call_command('backfill', 'post_is_visible', batch_size=2, stdout=out)
+    visible = set(
+        Post.objects.filter(is_visible=True).values_list('pk', flat=True)
+    )
+    assert visible == {post.pk for post in posts[2:]}, (
+        'Убедитесь, что заполнение продолжается с сохранённого pk.'
+    )
+    assert TaskState.get_value('backfill:post_is_visible') == {
+        'last_pk': posts[-1].pk, 'done': 5, 'finished': True
+    }
+    assert 'строк/с' in out.getvalue()
+
+    call_command(
+        'backfill', 'post_is_visible', restart=True, stdout=StringIO()
+    )
+    assert Post.objects.filter(is_visible=True).count() == 5
@@ -0,0 +1,33 @@
+import gzip
+import sqlite3
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.mark.parametrize('compress', [False, True])
+def test_backup_db(tmp_path, compress):
+    destination = tmp_path / 'backup.sqlite3'
+    out = StringIO()
+    call_command(
+        'backup_db', str(destination), pages=5, compress=compress, stdout=out
+    )
+    if compress:
+        copy = tmp_path / 'copy.sqlite3'
+        with gzip.open(tmp_path / 'backup.sqlite3.gz') as source:
+            copy.write_bytes(source.read())
+    else:
+        copy = destination
+    connection = sqlite3.connect(copy)
+    tables = {row[0] for row in connection.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table'"
+    )}
+    connection.close()
+    assert 'blog_post' in tables, (
+        'Убедитесь, что команда backup_db копирует базу целиком.'
+    )
+    assert not list(tmp_path.glob('*.tmp'))
+    assert 'проверка' in out.getvalue()
@@ -0,0 +1,59 @@
+import time
+
+import pytest
+
+from blog.cache_backends import SQLiteCache
+
+
+@pytest.fixture
+def sqlite_cache(tmp_path):
+    return SQLiteCache(
+        tmp_path / 'cache.sqlite3',
+        {'OPTIONS': {'MAX_ENTRIES': 10, 'CULL_FREQUENCY': 2}}
+    )
+
+
+def test_basic_operations(sqlite_cache):
+    sqlite_cache.set('a', {'posts': [1, 2]})
+    assert sqlite_cache.get('a') == {'posts': [1, 2]}
+    assert sqlite_cache.get('missing', 'default') == 'default'
+    assert not sqlite_cache.add('a', 'other')
+    assert sqlite_cache.add('b', 1)
+    assert sqlite_cache.incr('b', 2) == 3
+    with pytest.raises(ValueError):
+        sqlite_cache.incr('missing')
+    sqlite_cache.set_many({'c': 'c', 'd': 'd'})
+    assert sqlite_cache.get_many(['a', 'c', 'd', 'missing']) == {
+        'a': {'posts': [1, 2]}, 'c': 'c', 'd': 'd'
+    }
+    assert sqlite_cache.delete('c')
+    assert not sqlite_cache.has_key('c')
+
+
+def test_expired_entries_are_not_returned(sqlite_cache):
+    sqlite_cache.set('a', 1, timeout=0.01)
+    sqlite_cache.set('forever', 1, timeout=None)
+    time.sleep(0.02)
+    assert sqlite_cache.get('a') is None, (
+        'Убедитесь, что просроченная запись не отдаётся.'
+    )
+    assert sqlite_cache.add('a', 2)
+    assert sqlite_cache.get('a') == 2
+    assert sqlite_cache.get('forever') == 1
+
+
+def test_cull_keeps_recently_read_entries(sqlite_cache, monkeypatch):
+    monkeypatch.setattr('blog.cache_backends.CULL_CHECK_INTERVAL', 1)
+    sqlite_cache.set('kept', 1)
+    sqlite_cache._connection.execute(
+        "UPDATE cache SET accessed = accessed + 1000 WHERE key LIKE '%kept'"
+    )
+    for number in range(20):
+        sqlite_cache.set(f'key:{number}', number)
+    count = sqlite_cache._connection.execute(
+        'SELECT COUNT(*) FROM cache'
+    ).fetchone()[0]
+    assert count <= 11, 'Убедитесь, что кэш ограничен MAX_ENTRIES.'
+    assert sqlite_cache.get('kept') == 1, (
+        'Убедитесь, что вытесняются давно не читавшиеся записи.'
+    )
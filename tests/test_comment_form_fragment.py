@@ -0,0 +1,29 @@
+import pytest
+
+from blog.templatetags.blog_forms import _comment_form_parts
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_comment_form_fragment(
+    user_client, another_user_client, post_with_published_location
+):
+    _comment_form_parts.cache_clear()
+    post = post_with_published_location
+    url = f'/posts/{post.id}/'
+    first = user_client.get(url)
+    second = another_user_client.get(url)
+    for response in (first, second):
+        content = response.content.decode()
+        assert f'action="/posts/{post.id}/comment/"' in content, (
+            'Убедитесь, что форма комментария отправляется '
+            'на адрес добавления комментария к посту.'
+        )
+        assert 'name="text"' in content
+        assert 'name="csrfmiddlewaretoken"' in content, (
+            'Убедитесь, что в форму комментария подставляется CSRF-токен.'
+        )
+        assert response.context['form'] is not None
+    assert first.cookies['csrftoken'].value != (
+        second.cookies['csrftoken'].value
+    ), 'Убедитесь, что CSRF-токен не попадает в кэш формы.'
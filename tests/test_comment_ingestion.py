@@ -0,0 +1,79 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import caches
+from django.test import override_settings
+
+from blog.comment_buffer import CommentBuffer
+from blog.models import Comment
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def clear_ratelimit_cache():
+    caches['ratelimit'].clear()
+    yield
+    caches['ratelimit'].clear()
+
+
+@override_settings(BLOG_COMMENT_RATE_LIMIT=(2, 60))
+def test_comment_rate_limit_is_per_user(
+    user_client, another_user_client, post_with_published_location
+):
+    url = f'/posts/{post_with_published_location.id}/comment/'
+    for client in (user_client, user_client, another_user_client):
+        response = client.post(url, {'text': 'Комментарий'})
+        assert response.status_code == HTTPStatus.FOUND, (
+            'Убедитесь, что пользователи с одного IP не делят общий лимит.'
+        )
+
+
+@override_settings(BLOG_COMMENT_RATE_LIMIT=(2, 60))
+def test_comment_rate_limit(user_client, post_with_published_location):
+    url = f'/posts/{post_with_published_location.id}/comment/'
+    for _ in range(2):
+        response = user_client.post(url, {'text': 'Комментарий'})
+        assert response.status_code == HTTPStatus.FOUND
+    response = user_client.post(url, {'text': 'Комментарий'})
+    assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+        'Убедитесь, что частота добавления комментариев ограничена.'
+    )
+    assert Comment.objects.count() == 2
+
+
+def test_comment_buffer_writes_batch(user, post_with_published_location):
+    buffer = CommentBuffer(max_size=3, max_latency=60)
+    for i in range(2):
+        buffer.add(Comment(
+            text=f'Комментарий {i}', author=user,
+            post=post_with_published_location,
+        ))
+    assert not Comment.objects.exists()
+    buffer.add(Comment(
+        text='Комментарий 2', author=user, post=post_with_published_location,
+    ))
+    assert Comment.objects.count() == 3, (
+        'Убедитесь, что заполненная пачка комментариев записывается сразу.'
+    )
+    assert all(
+        comment.text_html for comment in Comment.objects.all()
+    )
+
+
+def test_comment_buffer_keeps_valid_comments(
+    user, post_with_published_location, caplog
+):
+    post = post_with_published_location
+    CommentBuffer.write([
+        Comment(text='Первый', author=user, post=post),
+        Comment(text='Без автора', post=post),
+        Comment(text='Третий', author=user, post=post),
+    ])
+    assert set(Comment.objects.values_list('text', flat=True)) == {
+        'Первый', 'Третий'
+    }, (
+        'Убедитесь, что ошибка в одном комментарии не теряет '
+        'остальные комментарии пачки.'
+    )
+    assert 'потерян' in caplog.text
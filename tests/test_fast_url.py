@@ -0,0 +1,32 @@
+import pytest
+from django.urls import clear_script_prefix, reverse, set_script_prefix
+
+from blog.reversing import fast_reverse
+
+
+@pytest.mark.parametrize('viewname, args', [
+    ('blog:index', ()),
+    ('blog:post_detail', (42,)),
+    ('blog:category_posts', ('travel-2024',)),
+    ('blog:profile', ('user.name@example+1',)),
+    ('blog:edit_comment', (1, 7)),
+])
+def test_fast_reverse_matches_reverse(viewname, args):
+    for _ in range(2):
+        assert fast_reverse(viewname, *args) == reverse(
+            viewname, args=args
+        ), (
+            'Убедитесь, что быстрый reverse строит тот же адрес, '
+            'что и django.urls.reverse.'
+        )
+
+
+def test_fast_reverse_respects_script_prefix():
+    fast_reverse('blog:post_detail', 1)
+    set_script_prefix('/blog/')
+    try:
+        assert fast_reverse('blog:post_detail', 1) == '/blog/posts/1/', (
+            'Убедитесь, что быстрый reverse учитывает префикс приложения.'
+        )
+    finally:
+        clear_script_prefix()
@@ -0,0 +1,63 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.cache import (
+    LISTINGS_NAMESPACE, LocalCache, cache, get_or_compute
+)
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_local_cache_evicts_least_recently_used():
+    local_cache = LocalCache(max_bytes=150)
+    local_cache.set('a', 'a' * 40, 1, float('inf'))
+    local_cache.set('b', 'b' * 40, 1, float('inf'))
+    assert local_cache.get('a', 1) == (True, 'a' * 40)
+    local_cache.set('c', 'c' * 40, 1, float('inf'))
+    assert local_cache.get('b', 1) == (False, None), (
+        'Убедитесь, что при превышении объёма вытесняется давно '
+        'не использованная запись.'
+    )
+    assert local_cache.get('a', 1)[0]
+    assert local_cache.size <= local_cache.max_bytes
+    assert local_cache.get('a', 2) == (False, None), (
+        'Убедитесь, что запись другой версии не отдаётся.'
+    )
+
+
+def test_category_lookup_is_cached_in_process(client, mixer):
+    category = mixer.blend('blog.Category', is_published=True)
+    url = f'/category/{category.slug}/'
+    assert client.get(url).status_code == 200
+    with CaptureQueriesContext(connection) as queries:
+        assert client.get(url).status_code == 200
+    assert not any(
+        'FROM "blog_category"' in query['sql']
+        for query in queries.captured_queries
+    ), 'Убедитесь, что категория берётся из кэша процесса.'
+    category.is_published = False
+    category.save()
+    assert client.get(url).status_code == 404, (
+        'Убедитесь, что изменение категории сбрасывает кэш процесса.'
+    )
+
+
+def test_none_result_does_not_wait_for_lock(monkeypatch):
+    calls = []
+
+    def compute():
+        calls.append(1)
+
+    assert get_or_compute(LISTINGS_NAMESPACE, 'missing', compute, 60) is None
+    cache.add(f'blog:{LISTINGS_NAMESPACE}:swr:missing:lock', True)
+
+    def sleep(seconds):
+        raise AssertionError('Ожидание блокировки')
+
+    monkeypatch.setattr('time.sleep', sleep)
+    assert get_or_compute(LISTINGS_NAMESPACE, 'missing', compute, 60) is None
+    assert len(calls) == 1, (
+        'Убедитесь, что пустой результат запоминается ненадолго и '
+        'запросы не ждут блокировку пересчёта.'
+    )
@@ -0,0 +1,19 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_maintain_db_report(mixer):
+    mixer.cycle(3).blend('blog.Post')
+    out = StringIO()
+    call_command('maintain_db', vacuum_budget=0.1, stdout=out)
+    output = out.getvalue()
+    assert 'ANALYZE' in output
+    assert 'blog_post: 3 строк' in output, (
+        'Убедитесь, что команда maintain_db выводит число строк таблиц.'
+    )
+    for table in ('blog_comment', 'blog_category', 'blog_location'):
+        assert f'{table}:' in output
@@ -0,0 +1,84 @@
+import pytest
+from django.test import override_settings
+
+from blog.cache import cache
+from blog.page_cache import page_cache_name
+
+pytestmark = [pytest.mark.django_db]
+
+
+@override_settings(BLOG_PAGE_CACHE=True)
+def test_page_cached_once_for_all_users(
+    client, user_client, another_user_client, post_with_published_location,
+    django_assert_num_queries
+):
+    post = post_with_published_location
+    url = f'/posts/{post.id}/'
+    author_page = user_client.get(url).content.decode()
+    assert f'/posts/{post.id}/edit/' in author_page
+    assert '<!--hole:' not in author_page
+
+    other_page = another_user_client.get(url).content.decode()
+    assert f'/posts/{post.id}/edit/' not in other_page, (
+        'Убедитесь, что кнопки автора не попадают в общий кэш страницы.'
+    )
+    assert 'name="csrfmiddlewaretoken"' in other_page
+    assert f'/profile/{post.author.username}/' in other_page
+
+    anonymous_page = client.get(url).content.decode()
+    assert 'name="csrfmiddlewaretoken"' not in anonymous_page
+    assert 'Войти' in anonymous_page
+
+
+@override_settings(BLOG_PAGE_CACHE=True)
+def test_page_cache_invalidated_by_post_change(
+    client, post_with_published_location
+):
+    post = post_with_published_location
+    assert post.title in client.get('/').content.decode()
+    post.title = 'Новый заголовок'
+    post.save()
+    assert 'Новый заголовок' in client.get('/').content.decode(), (
+        'Убедитесь, что изменение поста сбрасывает кэш страниц.'
+    )
+
+
+@override_settings(BLOG_PAGE_CACHE=True)
+def test_hidden_post_page_not_cached(user_client, mixer, user):
+    post = mixer.blend('blog.Post', author=user, is_published=False)
+    url = f'/posts/{post.id}/'
+    assert user_client.get(url).status_code == 200
+    user_client.logout()
+    assert user_client.get(url).status_code == 404, (
+        'Убедитесь, что страница скрытого поста не кэшируется.'
+    )
+
+
+@override_settings(BLOG_PAGE_CACHE=True)
+def test_hidden_post_page_not_served_stale(
+    client, post_with_published_location, monkeypatch
+):
+    post = post_with_published_location
+    url = f'/posts/{post.id}/'
+    assert client.get(url).status_code == 200
+    # Пересчёт страницы идёт в другом процессе.
+    add = cache.add
+    monkeypatch.setattr(cache, 'add', lambda key, *args, **kwargs: (
+        not key.endswith(':lock') and add(key, *args, **kwargs)
+    ))
+    monkeypatch.setattr('blog.cache.LOCK_WAIT', 0)
+    post.is_published = False
+    post.save()
+    assert client.get(url).status_code == 404, (
+        'Убедитесь, что страница скрытого поста не отдаётся из кэша '
+        'как устаревшая.'
+    )
+
+
+def test_page_cache_key_ignores_unknown_params(rf):
+    assert page_cache_name(rf.get('/', {'x': '1'})) == page_cache_name(
+        rf.get('/')
+    ), 'Убедитесь, что посторонние параметры не создают новые записи кэша.'
+    assert page_cache_name(rf.get('/', {'page': '2'})) != page_cache_name(
+        rf.get('/')
+    )
@@ -0,0 +1,83 @@
+from datetime import timedelta
+
+import pytest
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.utils import timezone
+
+from blog.cache import cache
+from blog.models import Post
+from blog.paginators import PostPaginator
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_count_is_cached_and_invalidated(mixer, user):
+    mixer.cycle(3).blend('blog.Post', author=user)
+    assert PostPaginator(Post.objects.all(), 10, cache_key='test').count == 3
+    with CaptureQueriesContext(connection) as queries:
+        paginator = PostPaginator(Post.objects.all(), 10, cache_key='test')
+        assert paginator.count == 3
+    assert not queries.captured_queries, (
+        'Убедитесь, что число постов берётся из кэша.'
+    )
+    mixer.blend('blog.Post', author=user)
+    assert PostPaginator(Post.objects.all(), 10, cache_key='test').count == 4
+
+
+def test_elided_page_range():
+    paginator = PostPaginator(list(range(100)), 1)
+    page = paginator.page(50)
+    page_range = list(page.elided_page_range)
+    assert page_range[0] == 1
+    assert page_range[-1] == 100
+    assert paginator.ELLIPSIS in page_range
+    assert len(page_range) < 10
+
+
+def test_count_query_has_no_group_by(mixer, user):
+    mixer.cycle(3).blend('blog.Post', author=user)
+    paginator = PostPaginator(
+        Post.objects.get_posts(),
+        10,
+        count_queryset=Post.objects.get_posts_for_count(),
+    )
+    with CaptureQueriesContext(connection) as queries:
+        paginator.count
+    sql = queries.captured_queries[0]['sql'].upper()
+    assert 'GROUP BY' not in sql, (
+        'Убедитесь, что подсчёт постов выполняется без GROUP BY.'
+    )
+    assert 'BLOG_LOCATION' not in sql
+    assert 'ORDER BY' not in sql
+
+
+def test_listing_result_is_shared_within_clock_bucket(mixer, user, client):
+    mixer.cycle(3).blend(
+        'blog.Post', author=user, is_published=True,
+        category__is_published=True,
+        pub_date=timezone.now() - timedelta(days=1),
+    )
+    client.get('/')
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get('/')
+    assert len(response.context['page_obj']) == 3
+    assert not any(
+        'FROM "blog_post"' in query['sql']
+        for query in queries.captured_queries
+    ), 'Убедитесь, что повторный запрос ленты берётся из кэша.'
+
+
+def test_stale_count_served_while_another_process_recomputes(mixer, user):
+    mixer.cycle(3).blend('blog.Post', author=user)
+    assert PostPaginator(Post.objects.all(), 10, cache_key='test').count == 3
+    mixer.blend('blog.Post', author=user)
+    lock_key = 'blog:posts:swr:count:test:lock'
+    cache.add(lock_key, True)
+    paginator = PostPaginator(Post.objects.all(), 10, cache_key='test')
+    assert paginator.count == 3, (
+        'Убедитесь, что пока число пересчитывает другой процесс, '
+        'отдаётся прежнее значение.'
+    )
+    cache.delete(lock_key)
+    assert PostPaginator(Post.objects.all(), 10, cache_key='test').count == 4
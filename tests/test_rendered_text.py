@@ -0,0 +1,44 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Comment, Post
+from blog.rendering import RENDERER_VERSION
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_text_html_rendered_on_save(mixer):
+    post = mixer.blend('blog.Post', text='<b>один</b>\nдва')
+    assert post.text_html == '&lt;b&gt;один&lt;/b&gt;<br>два'
+    assert post.text_html_version == RENDERER_VERSION
+
+
+def test_rerender_texts_command(mixer):
+    post = mixer.blend('blog.Post', text='один\nдва')
+    Post.objects.filter(pk=post.pk).update(text_html='', text_html_version=0)
+    call_command('rerender_texts')
+    post.refresh_from_db()
+    assert post.text_html == 'один<br>два', (
+        'Убедитесь, что команда rerender_texts перестраивает HTML текста.'
+    )
+
+
+def test_thread_with_stale_html_loads_in_one_query(
+    client, post_with_published_location, mixer
+):
+    post = post_with_published_location
+    mixer.cycle(10).blend('blog.Comment', post=post, text='один\nдва')
+    Comment.objects.update(text_html='', text_html_version=0)
+    with CaptureQueriesContext(connection) as queries:
+        content = client.get(f'/posts/{post.id}/').content.decode()
+    assert content.count('один<br>два') == 10
+    comment_queries = [
+        query for query in queries.captured_queries
+        if 'FROM "blog_comment"' in query['sql']
+    ]
+    assert len(comment_queries) == 1, (
+        'Убедитесь, что комментарии с устаревшим HTML не догружают '
+        'текст отдельным запросом на каждый комментарий.'
+    )
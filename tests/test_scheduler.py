@@ -0,0 +1,61 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog.models import Post, TaskState
+from blog.signals import post_published
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_scheduler_fires_once_per_post(mixer, user):
+    start = timezone.now() - timedelta(hours=1)
+    TaskState.set_value(
+        'run_scheduler', {'pub_date': start.isoformat(), 'pk': 0}
+    )
+    post = mixer.blend(
+        'blog.Post', author=user, is_published=True,
+        category__is_published=True,
+        pub_date=timezone.now() + timedelta(minutes=1),
+    )
+    assert not post.is_visible
+    Post.objects.filter(pk=post.pk).update(
+        pub_date=timezone.now() - timedelta(minutes=1)
+    )
+    published = []
+
+    def receiver(sender, posts, **kwargs):
+        published.extend(posts)
+
+    post_published.connect(receiver)
+    try:
+        call_command('run_scheduler', once=True, stdout=StringIO())
+        call_command('run_scheduler', once=True, stdout=StringIO())
+    finally:
+        post_published.disconnect(receiver)
+    assert [p.pk for p in published] == [post.pk], (
+        'Убедитесь, что сигнал post_published отправляется один раз '
+        'для каждой наступившей публикации.'
+    )
+    assert Post.objects.get(pk=post.pk).is_visible
+    assert TaskState.get_value('run_scheduler')['pk'] == post.pk
+
+
+def test_scheduler_first_run_saves_cursor(mixer):
+    call_command('run_scheduler', once=True, stdout=StringIO())
+    assert TaskState.get_value('run_scheduler') is not None, (
+        'Убедитесь, что первый запуск run_scheduler сразу сохраняет курсор.'
+    )
+    post = mixer.blend(
+        'blog.Post', is_published=True, category__is_published=True,
+        pub_date=timezone.now() + timedelta(minutes=1),
+    )
+    Post.objects.filter(pk=post.pk).update(pub_date=timezone.now())
+    call_command('run_scheduler', once=True, stdout=StringIO())
+    assert Post.objects.get(pk=post.pk).is_visible, (
+        'Убедитесь, что после перезапуска публикуются посты, дата '
+        'которых наступила между запусками.'
+    )
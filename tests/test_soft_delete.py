@@ -0,0 +1,93 @@
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.db import DatabaseError
+from django.db.models import QuerySet
+
+from blog.deletion import PURGE_USERS_TASK, purge, soft_delete_users
+from blog.models import Comment, Post, TaskState
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_deleted_post_is_hidden_until_purged(
+    user_client, post_with_published_location, mixer
+):
+    post = post_with_published_location
+    mixer.cycle(3).blend('blog.Comment', post=post)
+    post.delete()
+    assert not Post.objects.filter(pk=post.pk).exists()
+    assert Post.all_objects.filter(pk=post.pk).exists()
+    assert user_client.get(f'/posts/{post.pk}/').status_code == 404
+    call_command('purge_deleted', batch_size=2, pause=0, stdout=StringIO())
+    assert not Post.all_objects.filter(pk=post.pk).exists()
+    assert not Comment.objects.filter(post_id=post.pk).exists()
+
+
+def test_soft_deleted_user_is_purged(mixer, another_user):
+    User = get_user_model()
+    user = mixer.blend(User)
+    post = mixer.blend('blog.Post', author=user)
+    mixer.blend('blog.Comment', author=user, post=mixer.blend('blog.Post'))
+    mixer.blend('blog.Comment', author=another_user, post=post)
+    soft_delete_users(User.objects.filter(pk=user.pk))
+    user.refresh_from_db()
+    assert not user.is_active
+    assert not Post.objects.filter(author=user).exists(), (
+        'Убедитесь, что посты удалённого пользователя сразу скрываются.'
+    )
+    call_command('purge_deleted', pause=0, stdout=StringIO())
+    assert not User.objects.filter(pk=user.pk).exists()
+    assert not Comment.objects.filter(author=user).exists()
+    assert not Comment.objects.filter(post=post).exists()
+
+
+@pytest.fixture
+def post_with_image(mixer, settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    post = mixer.blend('blog.Post')
+    post.image.save('picture.jpg', ContentFile(b'image'))
+    post.delete()
+    return post
+
+
+def test_image_deleted_after_commit(
+    post_with_image, django_capture_on_commit_callbacks
+):
+    path = Path(post_with_image.image.path)
+    with django_capture_on_commit_callbacks(execute=True):
+        purge(batch_size=10, pause=0)
+    assert not path.exists()
+
+
+def test_image_kept_on_rollback(
+    post_with_image, django_capture_on_commit_callbacks, monkeypatch
+):
+    def fail(self):
+        raise DatabaseError
+
+    monkeypatch.setattr(QuerySet, 'delete', fail)
+    with django_capture_on_commit_callbacks(execute=True):
+        with pytest.raises(DatabaseError):
+            purge(batch_size=10, pause=0)
+    assert Path(post_with_image.image.path).exists(), (
+        'Убедитесь, что файлы удаляются только после фиксации '
+        'удаления постов.'
+    )
+
+
+def test_hard_deleted_user_leaves_purge_queue(mixer):
+    User = get_user_model()
+    user = mixer.blend(User)
+    mixer.blend('blog.Post', author=user)
+    soft_delete_users(User.objects.filter(pk=user.pk))
+    # Встроенный User.delete() не мягкий: всё удаляется каскадом.
+    user.delete()
+    assert not Post.all_objects.filter(author_id=user.pk).exists()
+    result = purge(batch_size=10, pause=0)
+    assert result['users'] == 0
+    assert TaskState.get_value(PURGE_USERS_TASK) == []
@@ -0,0 +1,93 @@
+from types import SimpleNamespace
+
+import pytest
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+
+from blogicum import static
+from blogicum.middleware import ThresholdGZipMiddleware
+from blogicum.storage import gzip_compress
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def static_root(tmp_path, monkeypatch):
+    (tmp_path / 'app.abc123.css').write_bytes(b'body {}' * 100)
+    (tmp_path / 'app.abc123.css.gz').write_bytes(
+        gzip_compress(b'body {}' * 100)
+    )
+    (tmp_path / 'app.abc123.css.br').write_bytes(b'br')
+    monkeypatch.setattr(static, 'staticfiles_storage', SimpleNamespace(
+        hashed_files={'app.css': 'app.abc123.css'}
+    ))
+    with override_settings(STATIC_ROOT=tmp_path):
+        yield tmp_path
+
+
+def serve(path, accept_encoding=''):
+    request = RequestFactory().get(
+        f'/static/{path}', HTTP_ACCEPT_ENCODING=accept_encoding
+    )
+    return static.serve(request, path)
+
+
+@pytest.mark.parametrize('accept_encoding, encoding', [
+    ('gzip, deflate, br', 'br'),
+    ('gzip', 'gzip'),
+    ('br;q=0.5, gzip', 'gzip'),
+    ('gzip;q=0, br;q=0', None),
+    ('*', 'br'),
+    ('*, br;q=0', 'gzip'),
+    ('', None),
+])
+def test_serve_picks_compressed_copy(static_root, accept_encoding, encoding):
+    response = serve('app.abc123.css', accept_encoding)
+    assert response.headers.get('Content-Encoding') == encoding, (
+        'Убедитесь, что сжатая копия выбирается по Accept-Encoding '
+        'с учётом q.'
+    )
+    assert response.headers['Vary'] == 'Accept-Encoding'
+    response.close()
+
+
+def test_serve_cache_headers(static_root):
+    (static_root / 'plain.css').write_bytes(b'body {}')
+    hashed = serve('app.abc123.css')
+    assert 'immutable' in hashed.headers['Cache-Control'], (
+        'Убедитесь, что файлы с хешем в имени кэшируются навсегда.'
+    )
+    plain = serve('plain.css')
+    assert 'immutable' not in plain.headers['Cache-Control']
+    hashed.close()
+    plain.close()
+
+
+@override_settings(GZIP_MIN_LENGTH=100)
+@pytest.mark.parametrize('length, compressed', [(99, False), (5000, True)])
+def test_gzip_threshold(length, compressed):
+    middleware = ThresholdGZipMiddleware(
+        lambda request: HttpResponse('a' * length)
+    )
+    response = middleware(
+        RequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip')
+    )
+    encoding = response.headers.get('Content-Encoding')
+    assert (encoding == 'gzip') is compressed, (
+        'Убедитесь, что сжимаются только ответы не короче GZIP_MIN_LENGTH.'
+    )
+
+
+@override_settings(GZIP_MIN_LENGTH=100)
+def test_gzip_skips_binary_and_streaming(static_root):
+    (static_root / 'logo.png').write_bytes(b'\x89PNG' * 5000)
+    request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip')
+    for get_response in (
+        lambda request: static.serve(request, 'logo.png'),
+        lambda request: HttpResponse(b'a' * 5000, content_type='image/png'),
+    ):
+        response = ThresholdGZipMiddleware(get_response)(request)
+        assert 'Content-Encoding' not in response.headers, (
+            'Убедитесь, что файлы и двоичные ответы не сжимаются повторно.'
+        )
+        response.close()
@@ -0,0 +1,32 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+
+from blog import profiling
+
+pytestmark = [pytest.mark.django_db]
+
+
+@override_settings(BLOG_TEMPLATE_PROFILING=True)
+def test_template_profile_report(client, mixer):
+    mixer.blend('blog.Post')
+    client.get('/')
+    report = profiling.get_reports()[0]
+    assert report.path == '/'
+    assert 'blog/index.html' in report.templates
+    assert report.tags['fast_url'].calls > 0, (
+        'Убедитесь, что профилировщик считает вызовы тега fast_url.'
+    )
+
+    staff = get_user_model().objects.create_superuser(
+        'admin', 'admin@example.com', 'password'
+    )
+    client.force_login(staff)
+    response = client.get('/template-profile/')
+    assert response.status_code == 200
+    assert 'blog/index.html' in response.content.decode()
+
+
+def test_template_profile_is_staff_only(user_client):
+    response = user_client.get('/template-profile/')
+    assert response.status_code == 302
@@ -0,0 +1,53 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def visible_post(mixer, user):
+    return mixer.blend(
+        'blog.Post', author=user, is_published=True,
+        category__is_published=True,
+        pub_date=timezone.now() - timedelta(days=1),
+    )
+
+
+def test_category_flip_updates_posts(visible_post):
+    assert Post.objects.get(pk=visible_post.pk).is_visible
+    category = visible_post.category
+    category.is_published = False
+    category.save()
+    assert not Post.objects.get(pk=visible_post.pk).is_visible, (
+        'Убедитесь, что снятие категории с публикации скрывает её посты.'
+    )
+    category.is_published = True
+    category.save()
+    assert Post.objects.get(pk=visible_post.pk).is_visible
+    category.delete()
+    assert not Post.objects.get(pk=visible_post.pk).is_visible, (
+        'Убедитесь, что посты удалённой категории скрываются.'
+    )
+
+
+def test_publish_scheduled(visible_post):
+    Post.objects.filter(pk=visible_post.pk).update(is_visible=False)
+    assert not Post.objects.get_posts().filter(pk=visible_post.pk).exists()
+    call_command('publish_scheduled', stdout=StringIO())
+    assert Post.objects.get_posts().filter(pk=visible_post.pk).exists(), (
+        'Убедитесь, что publish_scheduled отмечает наступившие '
+        'отложенные публикации.'
+    )
+
+
+def test_listing_query_has_no_category_join():
+    sql = str(Post.objects.get_posts_for_count().query).upper()
+    assert 'JOIN' not in sql, (
+        'Убедитесь, что видимость поста проверяется без JOIN категории.'
+    )